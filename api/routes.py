@@ -1,78 +1,126 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import os
+import re
+import uuid
+import asyncio
+import hashlib
 import logging
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Form, Depends
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-
-from api.schemas import (
-    ChunkingRequest,
-    ChunkingResponse,
-    QueryRequest,
-    QueryResponse
-)
+import aiofiles
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+from fastapi.responses import JSONResponse, StreamingResponse
+from langchain_core.documents import Document
+
+from api.schemas import ChunkingResponse
 from src.chunking.recursive import RecursiveChunker
 from src.chunking.semantic import SemanticChunker
 from src.rag.query import RAGQuery
-from src.utils.config import SEMANTIC_COLLECTION_NAME, UPLOAD_FOLDER, RECURSIVE_COLLECTION_NAME, load_config
+from src.utils.config import UPLOAD_CHUNK_SIZE, INGEST_BATCH_SIZE, COLLECTIONS_CACHE_TTL, PDF_STRATEGY, load_config
 from src.utils.parser import parse_pdf
 from src.utils.html_parser import parse_html_file
-from src.embeddings.titan import TitanEmbeddings
-from src.storage.qdrant import QdrantStorage
+from src.embeddings.titan import get_embeddings
+from src.storage.qdrant import get_async_storage, get_storage
 from src.utils.upload import validate_file_type, create_upload_folder
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Collection name patterns, compiled once
+_VALID_COLLECTION_NAME = re.compile(r'\w+')
+_CHUNKING_TYPE_PREFIX = re.compile(r'(recursive|semantic)_')
+
 # Configure upload folder
 UPLOAD_FOLDER = load_config("UPLOAD_FOLDER", "uploads")
 create_upload_folder(UPLOAD_FOLDER)
 
+# Parsed documents are cached by file content; bump the version when parser output changes
+PARSE_CACHE_FOLDER = os.path.join(UPLOAD_FOLDER, ".parse_cache")
+PARSE_CACHE_VERSION = 4
+create_upload_folder(PARSE_CACHE_FOLDER)
+
 # Initialize components
 recursive_chunker = RecursiveChunker()
 semantic_chunker = SemanticChunker()
-embeddings = TitanEmbeddings()
-storage = QdrantStorage()
+embeddings = get_embeddings()
+storage = get_storage()
+async_storage = get_async_storage()
 rag_query = RAGQuery()
+query_cache = rag_query.query_cache
+
+# Shared pool for CPU-bound chunking so it stays off the event loop
+# without competing with I/O work in the default executor
+_CPU_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="chunking")
+
+# Parses in progress, so concurrent requests for the same file share one
+_PARSES_IN_FLIGHT: Dict[Tuple[str, str], "asyncio.Future[List[Any]]"] = {}
 
-# Models
-class QueryRequest(BaseModel):
-    query: str
+# Short-lived cache for the assembled /collections listing
+_COLLECTIONS_CACHE_KEY = "_all_"
+collections_cache = TTLCache(maxsize=1, ttl=COLLECTIONS_CACHE_TTL)
 
-class QueryResponse(BaseModel):
-    query: str
-    recursive: Dict
-    semantic: Dict
-    comparison: str
+def _chunking_type(collection_name: str) -> str:
+    """
+    Infer the chunking type from a collection name prefix.
+    
+    Args:
+        collection_name: Collection name
+        
+    Returns:
+        "recursive", "semantic" or "unknown"
+    """
+    match = _CHUNKING_TYPE_PREFIX.match(collection_name)
+    return match.group(1) if match else "unknown"
 
 # Routes
 @router.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
     """
     Upload a document file (PDF or HTML).
+    
+    Files keep their original name. Re-uploading identical content leaves
+    the existing copy untouched.
     """
+    temp_path = None
     try:
         # Validate file type
-        file_extension = validate_file_type(file.filename)
-        
-        # Save file
-        file_path = os.path.join(UPLOAD_FOLDER, file.filename)
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        validate_file_type(file.filename)
+        filename = os.path.basename(file.filename)
+        
+        # Stream file to a temporary path in fixed-size blocks, hashing as we go
+        hasher = hashlib.sha256()
+        temp_path = os.path.join(UPLOAD_FOLDER, f".{uuid.uuid4().hex}.part")
+        async with aiofiles.open(temp_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                hasher.update(chunk)
+                await buffer.write(chunk)
+        
+        # Move into place unless the same content is already stored under this name
+        content_sha256 = hasher.hexdigest()
+        file_path = os.path.join(UPLOAD_FOLDER, filename)
+        if os.path.exists(file_path) and await asyncio.to_thread(_file_sha256, file_path) == content_sha256:
+            os.remove(temp_path)
+            logger.info("Upload of %s matches existing file %s", filename, file_path)
+        else:
+            os.replace(temp_path, file_path)
+        temp_path = None
         
         return JSONResponse(
             content={
                 "message": "File uploaded successfully",
-                "file_path": file_path
+                "file_path": file_path,
+                "filename": filename,
+                "content_sha256": content_sha256
             },
             status_code=200
         )
     except Exception as e:
-        logger.error(f"Error uploading file: {str(e)}")
+        logger.error("Error uploading file: %s", e)
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/process/recursive")
@@ -102,13 +150,15 @@ async def process_recursive_chunking(
         
         # Process document
         await process_file_recursive(file_path, file_extension, collection_name)
+        await asyncio.to_thread(query_cache.invalidate, collection_name)
+        collections_cache.clear()
         
         return ChunkingResponse(
             message="Document processed successfully with recursive chunking",
             collection_name=collection_name
         )
     except Exception as e:
-        logger.error(f"Error processing document: {str(e)}")
+        logger.error("Error processing document: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/process/semantic")
@@ -138,15 +188,147 @@ async def process_semantic_chunking(
         
         # Process document
         await process_file_semantic(file_path, file_extension, collection_name)
+        await asyncio.to_thread(query_cache.invalidate, collection_name)
+        collections_cache.clear()
         
         return ChunkingResponse(
             message="Document processed successfully with semantic chunking",
             collection_name=collection_name
         )
     except Exception as e:
-        logger.error(f"Error processing document: {str(e)}")
+        logger.error("Error processing document: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _serialize_chunks(docs: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Convert retrieved documents to JSON-ready chunk dictionaries.
+    
+    Args:
+        docs: Retrieved documents
+        
+    Returns:
+        List of chunk dictionaries
+    """
+    return [
+        {"content": doc.page_content, "metadata": doc.metadata}
+        for doc in docs
+    ] if docs else []
+
+def _sse_event(event: str, data: Any) -> bytes:
+    """
+    Encode a Server-Sent Event.
+    
+    Args:
+        event: Event name
+        data: JSON-serializable event payload
+        
+    Returns:
+        Encoded event
+    """
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+def _parse_query_params(query: Dict[str, Any]) -> Tuple[str, str, str]:
+    """
+    Extract query text and collection names from a query request.
+    
+    Args:
+        query: Query parameters
+        
+    Returns:
+        Tuple of query text, recursive collection and semantic collection
+    """
+    if "query" not in query:
+        raise HTTPException(status_code=400, detail="Query parameter is required")
+    
+    return (
+        query["query"],
+        query.get("recursive_collection", "recursive"),
+        query.get("semantic_collection", "semantic")
+    )
+
+async def _lookup_query(
+    query_text: str,
+    recursive_collection: str,
+    semantic_collection: str
+) -> Tuple[List[float], Optional[Dict[str, Any]]]:
+    """
+    Embed a query and look it up in the semantic query cache.
+    
+    Args:
+        query_text: Query text
+        recursive_collection: Name of the recursive collection
+        semantic_collection: Name of the semantic collection
+        
+    Returns:
+        Tuple of query embedding and cached response (None on a miss)
+    """
+    query_vector = await asyncio.to_thread(embeddings.embed_query, query_text)
+    cached_response = await asyncio.to_thread(
+        query_cache.lookup, query_vector, recursive_collection, semantic_collection
+    )
+    return query_vector, cached_response
+
+async def _complete_query(
+    query_text: str,
+    query_vector: List[float],
+    recursive_collection: str,
+    semantic_collection: str,
+    recursive_docs: List[Any],
+    semantic_docs: List[Any],
+    recursive_answer: str,
+    semantic_answer: str
+) -> Dict[str, Any]:
+    """
+    Compare both answers, assemble the query response and cache it.
+    
+    Args:
+        query_text: Query text
+        query_vector: Query embedding
+        recursive_collection: Name of the recursive collection
+        semantic_collection: Name of the semantic collection
+        recursive_docs: Documents retrieved from the recursive collection
+        semantic_docs: Documents retrieved from the semantic collection
+        recursive_answer: Answer generated from the recursive documents
+        semantic_answer: Answer generated from the semantic documents
+        
+    Returns:
+        Query response
+    """
+    # Compare the answers
+    comparison = await asyncio.to_thread(
+        rag_query.compare_answers, query_text, recursive_answer, semantic_answer
+    )
+    
+    # Get vector similarity comparison
+    vector_comparison = rag_query._compare_results(
+        recursive_docs[:5] if recursive_docs else [], 
+        semantic_docs[:5] if semantic_docs else []
+    )
+    
+    response = {
+        "query": query_text,
+        "recursive": {
+            "collection": recursive_collection,
+            "answer": recursive_answer,
+            "chunks": _serialize_chunks(recursive_docs)
+        },
+        "semantic": {
+            "collection": semantic_collection,
+            "answer": semantic_answer,
+            "chunks": _serialize_chunks(semantic_docs)
+        },
+        "analysis": {
+            "rag_comparison": comparison,
+            "vector_comparison": vector_comparison
+        }
+    }
+    
+    await asyncio.to_thread(
+        query_cache.store, query_text, query_vector, recursive_collection, semantic_collection, response
+    )
+    
+    return response
+
 @router.post("/query")
 async def query(query: Dict[str, Any]):
     """
@@ -161,59 +343,130 @@ async def query(query: Dict[str, Any]):
     Returns:
         JSON response with query results and analysis
     """
-    if "query" not in query:
-        raise HTTPException(status_code=400, detail="Query parameter is required")
-    
-    query_text = query["query"]
-    recursive_collection = query.get("recursive_collection", "recursive")
-    semantic_collection = query.get("semantic_collection", "semantic")
+    query_text, recursive_collection, semantic_collection = _parse_query_params(query)
     
     try:
-        # Get documents from both collections
-        recursive_docs = rag_query.search_collection(recursive_collection, query_text)
-        semantic_docs = rag_query.search_collection(semantic_collection, query_text)
-        
-        # Generate answers using RAG
-        recursive_answer = rag_query.generate_answer(query_text, recursive_docs)
-        semantic_answer = rag_query.generate_answer(query_text, semantic_docs)
+        # Serve paraphrases of recently answered queries from the cache
+        query_vector, cached_response = await _lookup_query(
+            query_text, recursive_collection, semantic_collection
+        )
+        if cached_response is not None:
+            return cached_response
         
-        # Compare the answers
-        comparison = rag_query.compare_answers(query_text, recursive_answer, semantic_answer)
+        # Get documents from both collections concurrently
+        recursive_docs, semantic_docs = await asyncio.gather(
+            rag_query.asearch_collection(recursive_collection, query_text, query_vector=query_vector),
+            rag_query.asearch_collection(semantic_collection, query_text, query_vector=query_vector)
+        )
         
-        # Get vector similarity comparison
-        vector_comparison = rag_query._compare_results(
-            recursive_docs[:5] if recursive_docs else [], 
-            semantic_docs[:5] if semantic_docs else []
+        # Generate answers using RAG concurrently
+        recursive_answer, semantic_answer = await asyncio.gather(
+            rag_query.agenerate_answer(query_text, recursive_docs),
+            rag_query.agenerate_answer(query_text, semantic_docs)
         )
         
-        return {
-            "query": query_text,
-            "recursive": {
-                "collection": recursive_collection,
-                "answer": recursive_answer,
-                "chunks": [
-                    {"content": doc.page_content, "metadata": doc.metadata}
-                    for doc in recursive_docs
-                ] if recursive_docs else []
-            },
-            "semantic": {
-                "collection": semantic_collection,
-                "answer": semantic_answer,
-                "chunks": [
-                    {"content": doc.page_content, "metadata": doc.metadata}
-                    for doc in semantic_docs
-                ] if semantic_docs else []
-            },
-            "analysis": {
-                "rag_comparison": comparison,
-                "vector_comparison": vector_comparison
-            }
-        }
+        return await _complete_query(
+            query_text, query_vector, recursive_collection, semantic_collection,
+            recursive_docs, semantic_docs, recursive_answer, semantic_answer
+        )
         
     except Exception as e:
-        logger.error(f"Error querying collections: {e}")
+        logger.error("Error querying collections: %s", e)
         raise HTTPException(status_code=500, detail=f"Error querying collections: {str(e)}")
 
+@router.post("/query/stream")
+async def query_stream(query: Dict[str, Any]):
+    """
+    Query both collections, streaming each result as a Server-Sent Event.
+    
+    Events are emitted as soon as each stage produces output:
+    ``recursive_chunks`` and ``semantic_chunks`` after retrieval,
+    ``recursive_answer_delta`` and ``semantic_answer_delta`` with each piece
+    of an answer as the model generates it, ``recursive_answer`` and
+    ``semantic_answer`` with each complete answer, then ``done`` with the
+    full response in the same shape as /query. A cache hit emits only
+    ``done``; failures emit ``error``.
+    
+    Args:
+        query: Query parameters (same as /query)
+        
+    Returns:
+        Streaming response of Server-Sent Events
+    """
+    query_text, recursive_collection, semantic_collection = _parse_query_params(query)
+    collections = {"recursive": recursive_collection, "semantic": semantic_collection}
+    
+    async def events():
+        updates = asyncio.Queue()
+        
+        async def retrieve_and_answer(kind: str, collection: str, query_vector: List[float]):
+            # Each collection streams its answer as soon as its documents arrive
+            try:
+                docs = await rag_query.asearch_collection(collection, query_text, query_vector=query_vector)
+                await updates.put((kind, "chunks", docs))
+                
+                parts = []
+                async for delta in rag_query.astream_answer(query_text, docs):
+                    parts.append(delta)
+                    await updates.put((kind, "answer_delta", delta))
+                await updates.put((kind, "answer", "".join(parts)))
+            except Exception as e:
+                await updates.put((kind, "error", e))
+        
+        tasks = []
+        try:
+            query_vector, cached_response = await _lookup_query(
+                query_text, recursive_collection, semantic_collection
+            )
+            if cached_response is not None:
+                yield _sse_event("done", cached_response)
+                return
+            
+            tasks = [
+                asyncio.create_task(retrieve_and_answer(kind, collection, query_vector))
+                for kind, collection in collections.items()
+            ]
+            
+            docs = {}
+            answers = {}
+            while len(answers) < len(collections):
+                kind, stage, value = await updates.get()
+                if stage == "error":
+                    raise value
+                if stage == "chunks":
+                    docs[kind] = value
+                    yield _sse_event(f"{kind}_chunks", {
+                        "collection": collections[kind],
+                        "chunks": _serialize_chunks(value)
+                    })
+                elif stage == "answer_delta":
+                    yield _sse_event(f"{kind}_answer_delta", {
+                        "collection": collections[kind],
+                        "delta": value
+                    })
+                else:
+                    answers[kind] = value
+                    yield _sse_event(f"{kind}_answer", {
+                        "collection": collections[kind],
+                        "answer": value
+                    })
+            
+            response = await _complete_query(
+                query_text, query_vector, recursive_collection, semantic_collection,
+                docs["recursive"], docs["semantic"], answers["recursive"], answers["semantic"]
+            )
+            yield _sse_event("done", response)
+            
+        except Exception as e:
+            logger.error("Error querying collections: %s", e)
+            yield _sse_event("error", {"error": f"Error querying collections: {str(e)}"})
+        finally:
+            # Stop outstanding work if the client disconnected mid-stream
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 @router.get("/collections")
 async def list_collections():
     """
@@ -223,30 +476,35 @@ async def list_collections():
         JSON response with collections
     """
     try:
-        collections = storage.list_collections()
+        cached_info = collections_cache.get(_COLLECTIONS_CACHE_KEY)
+        if cached_info is not None:
+            return {"collections": cached_info}
+        
+        collections = await async_storage.list_collections()
         
         # Get collection info
         collection_info = []
         for collection in collections:
             try:
-                info = storage.get_collection_info(collection)
+                info = await async_storage.get_collection_info(collection)
                 collection_info.append({
                     "name": collection,
                     "vector_count": info.get("vector_count", 0),
-                    "chunking_type": "recursive" if collection.startswith("recursive_") else "semantic" if collection.startswith("semantic_") else "unknown"
+                    "chunking_type": _chunking_type(collection)
                 })
             except Exception as e:
-                logger.error(f"Error getting info for collection {collection}: {e}")
+                logger.error("Error getting info for collection %s: %s", collection, e)
                 collection_info.append({
                     "name": collection,
                     "vector_count": 0,
-                    "chunking_type": "recursive" if collection.startswith("recursive_") else "semantic" if collection.startswith("semantic_") else "unknown",
+                    "chunking_type": _chunking_type(collection),
                     "error": str(e)
                 })
         
+        collections_cache[_COLLECTIONS_CACHE_KEY] = collection_info
         return {"collections": collection_info}
     except Exception as e:
-        logger.error(f"Error listing collections: {e}")
+        logger.error("Error listing collections: %s", e)
         raise HTTPException(status_code=500, detail=f"Error listing collections: {str(e)}")
 
 @router.post("/collections/create")
@@ -266,10 +524,11 @@ async def create_collection(collection_data: Dict[str, Any]):
     collection_name = collection_data["name"]
     
     try:
-        storage.create_collection(collection_name)
+        await async_storage.create_collection(collection_name)
+        collections_cache.clear()
         return {"message": f"Collection {collection_name} created successfully"}
     except Exception as e:
-        logger.error(f"Error creating collection {collection_name}: {e}")
+        logger.error("Error creating collection %s: %s", collection_name, e)
         raise HTTPException(status_code=500, detail=f"Error creating collection: {str(e)}")
 
 @router.delete("/collections/{collection_name}")
@@ -284,10 +543,12 @@ async def delete_collection(collection_name: str):
         JSON response with the collection name
     """
     try:
-        storage.delete_collection(collection_name)
+        await async_storage.delete_collection(collection_name)
+        await asyncio.to_thread(query_cache.invalidate, collection_name)
+        collections_cache.clear()
         return {"message": f"Collection {collection_name} deleted successfully"}
     except Exception as e:
-        logger.error(f"Error deleting collection {collection_name}: {e}")
+        logger.error("Error deleting collection %s: %s", collection_name, e)
         raise HTTPException(status_code=500, detail=f"Error deleting collection: {str(e)}")
 
 @router.post("/collections/rename")
@@ -309,17 +570,20 @@ async def rename_collection(rename_data: Dict[str, Any]):
     
     try:
         # Create new collection
-        storage.create_collection(new_name)
+        await async_storage.create_collection(new_name)
         
         # Copy data from old collection to new collection
-        storage.copy_collection(old_name, new_name)
+        await async_storage.copy_collection(old_name, new_name)
         
         # Delete old collection
-        storage.delete_collection(old_name)
+        await async_storage.delete_collection(old_name)
+        await asyncio.to_thread(query_cache.invalidate, old_name)
+        await asyncio.to_thread(query_cache.invalidate, new_name)
+        collections_cache.clear()
         
         return {"message": f"Collection {old_name} renamed to {new_name} successfully"}
     except Exception as e:
-        logger.error(f"Error renaming collection {old_name} to {new_name}: {e}")
+        logger.error("Error renaming collection %s to %s: %s", old_name, new_name, e)
         raise HTTPException(status_code=500, detail=f"Error renaming collection: {str(e)}")
 
 @router.get("/fix-collections")
@@ -331,36 +595,212 @@ async def fix_collections():
         JSON response with fixed collections
     """
     try:
-        collections = storage.list_collections()
+        collections = await async_storage.list_collections()
         fixed_collections = []
         
         for collection in collections:
             # Check if collection name has invalid characters
-            if not collection.isalnum() and not all(c.isalnum() or c == '_' for c in collection):
+            if not _VALID_COLLECTION_NAME.fullmatch(collection):
                 # Create a valid name
                 valid_name = ''.join(c if c.isalnum() or c == '_' else '_' for c in collection)
                 
                 # Rename collection
                 try:
                     # Create new collection
-                    storage.create_collection(valid_name)
+                    await async_storage.create_collection(valid_name)
                     
                     # Copy data from old collection to new collection
-                    storage.copy_collection(collection, valid_name)
+                    await async_storage.copy_collection(collection, valid_name)
                     
                     # Delete old collection
-                    storage.delete_collection(collection)
+                    await async_storage.delete_collection(collection)
+                    await asyncio.to_thread(query_cache.invalidate, collection)
+                    await asyncio.to_thread(query_cache.invalidate, valid_name)
                     
                     fixed_collections.append({"old_name": collection, "new_name": valid_name})
                 except Exception as e:
-                    logger.error(f"Error fixing collection {collection}: {e}")
+                    logger.error("Error fixing collection %s: %s", collection, e)
         
+        collections_cache.clear()
         return {"fixed_collections": fixed_collections}
     except Exception as e:
-        logger.error(f"Error fixing collections: {e}")
+        logger.error("Error fixing collections: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fixing collections: {str(e)}")
 
 # Background processing functions
+def _file_sha256(file_path: str) -> str:
+    """
+    Compute the SHA-256 digest of a file without reading it into memory at once.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Hex digest
+    """
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def _encode_parsed(documents: List[Any]) -> bytes:
+    """
+    Serialize parsed documents for the parse cache.
+    
+    Args:
+        documents: Parsed documents (LangChain documents or element dicts)
+        
+    Returns:
+        JSON bytes tagged with the parse cache version
+    """
+    return orjson.dumps({
+        "version": PARSE_CACHE_VERSION,
+        "documents": [
+            {"page_content": doc.page_content, "metadata": doc.metadata}
+            if isinstance(doc, Document) else {"element": doc}
+            for doc in documents
+        ]
+    })
+
+def _decode_parsed(data: bytes) -> List[Any]:
+    """
+    Deserialize parsed documents written by _encode_parsed.
+    
+    Args:
+        data: JSON bytes from the parse cache
+        
+    Returns:
+        List of parsed documents
+    """
+    payload = orjson.loads(data)
+    if payload.get("version") != PARSE_CACHE_VERSION:
+        raise ValueError(f"parse cache version {payload.get('version')} != {PARSE_CACHE_VERSION}")
+    return [
+        entry["element"] if "element" in entry
+        else Document(page_content=entry["page_content"], metadata=entry["metadata"])
+        for entry in payload["documents"]
+    ]
+
+def _parse_file_cached(file_path: str, file_extension: str) -> List[Any]:
+    """
+    Parse a file, reusing a previous parse of identical content.
+    
+    Args:
+        file_path: Path to the file
+        file_extension: File extension
+        
+    Returns:
+        List of parsed documents
+    """
+    digest = _file_sha256(file_path)
+    
+    # PDFs parse differently per strategy, so each strategy gets its own entry
+    if file_extension == '.pdf':
+        digest = f"{digest}.{PDF_STRATEGY}"
+    cache_path = os.path.join(
+        PARSE_CACHE_FOLDER, f"{digest}{file_extension}.v{PARSE_CACHE_VERSION}.json"
+    )
+    
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                documents = _decode_parsed(f.read())
+            logger.info("Loaded parsed documents for %s from cache", file_path)
+            return documents
+        except Exception as e:
+            logger.warning("Ignoring unreadable parse cache entry %s: %s", cache_path, e)
+    
+    if file_extension == '.pdf':
+        logger.info("Processing PDF file: %s", file_path)
+        documents = parse_pdf(file_path)
+    else:
+        logger.info("Processing HTML file: %s", file_path)
+        documents = parse_html_file(file_path)
+    
+    # Don't cache empty results; the HTML parser returns [] on failure
+    if documents:
+        try:
+            temp_path = f"{cache_path}.{uuid.uuid4().hex}.part"
+            data = _encode_parsed(documents)
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            logger.warning("Failed to write parse cache entry %s: %s", cache_path, e)
+    
+    return documents
+
+async def parse_file(file_path: str, file_extension: str) -> Optional[List[Any]]:
+    """
+    Parse a file into documents based on its type.
+    
+    Parsed documents are cached by file content, so processing the same file
+    with both chunking strategies only parses it once, even when both
+    requests arrive together.
+    
+    Args:
+        file_path: Path to the file
+        file_extension: File extension
+        
+    Returns:
+        List of parsed documents, or None if the file type is unsupported
+    """
+    if file_extension not in ['.pdf', '.html', '.htm']:
+        logger.error("Unsupported file type: %s", file_extension)
+        return None
+    
+    key = (os.path.realpath(file_path), file_extension)
+    parse = _PARSES_IN_FLIGHT.get(key)
+    if parse is None:
+        parse = asyncio.ensure_future(asyncio.to_thread(_parse_file_cached, file_path, file_extension))
+        _PARSES_IN_FLIGHT[key] = parse
+        parse.add_done_callback(lambda _: _PARSES_IN_FLIGHT.pop(key, None))
+    
+    # A cancelled request must not cancel a parse other requests are waiting on
+    documents = await asyncio.shield(parse)
+    
+    logger.info("Parsed %d documents from %s", len(documents), file_path)
+    return documents
+
+def split_chunks(chunks: List[Any]) -> Tuple[List[str], List[Dict]]:
+    """
+    Extract texts and metadata from chunks.
+    
+    Args:
+        chunks: Chunks as dictionaries or Document objects
+        
+    Returns:
+        Tuple of texts and metadata dictionaries
+    """
+    texts = []
+    metadatas = []
+    for chunk in chunks:
+        if isinstance(chunk, dict):
+            texts.append(chunk["content"])
+            metadatas.append(chunk.get("metadata", {}))
+        else:
+            texts.append(chunk.page_content)
+            metadatas.append(chunk.metadata)
+    return texts, metadatas
+
+async def embed_and_store_chunks(chunks: List[Any], collection_name: str):
+    """
+    Embed chunks and store them in a collection.
+    
+    Chunks are embedded in batches; each batch is uploaded while the next
+    one is being embedded.
+    
+    Args:
+        chunks: Chunks as dictionaries or Document objects
+        collection_name: Collection name
+    """
+    batches = (
+        split_chunks(chunks[start:start + INGEST_BATCH_SIZE])
+        for start in range(0, len(chunks), INGEST_BATCH_SIZE)
+    )
+    await async_storage.store_batches(collection_name, batches, embeddings.embed_documents_cached)
+
 async def process_file_recursive(file_path: str, file_extension: str, collection_name: str):
     """
     Process a file using recursive chunking.
@@ -372,45 +812,23 @@ async def process_file_recursive(file_path: str, file_extension: str, collection
     """
     try:
         # Parse the file based on its type
-        if file_extension == '.pdf':
-            logger.info(f"Processing PDF file: {file_path}")
-            documents = parse_pdf(file_path)
-        elif file_extension in ['.html', '.htm']:
-            logger.info(f"Processing HTML file: {file_path}")
-            documents = parse_html_file(file_path)
-        else:
-            logger.error(f"Unsupported file type: {file_extension}")
+        documents = await parse_file(file_path, file_extension)
+        if documents is None:
             return
         
-        logger.info(f"Parsed {len(documents)} documents from {file_path}")
-        
         # Chunk the documents
-        chunked_documents = recursive_chunker.chunk_documents(documents)
-        logger.info(f"Created {len(chunked_documents)} chunks")
-        
-        # Extract texts and metadata from chunks
-        texts = []
-        metadatas = []
-        for chunk in chunked_documents:
-            if isinstance(chunk, dict):
-                texts.append(chunk["content"])
-                metadatas.append(chunk.get("metadata", {}))
-            else:
-                texts.append(chunk.page_content)
-                metadatas.append(chunk.metadata)
-        
-        # Create collection and store documents
-        storage.create_collection(collection_name)
-        storage.store_documents(
-            collection_name=collection_name,
-            texts=texts,
-            embeddings=embeddings,
-            metadatas=metadatas
+        chunked_documents = await asyncio.get_running_loop().run_in_executor(
+            _CPU_POOL, recursive_chunker.chunk_documents, documents
         )
+        logger.info("Created %d chunks", len(chunked_documents))
+        
+        # Create collection unless it exists, then embed and store chunks
+        await async_storage.ensure_collection(collection_name)
+        await embed_and_store_chunks(chunked_documents, collection_name)
         
-        logger.info(f"Successfully processed {file_path} with recursive chunking")
+        logger.info("Successfully processed %s with recursive chunking", file_path)
     except Exception as e:
-        logger.error(f"Error processing {file_path} with recursive chunking: {e}")
+        logger.error("Error processing %s with recursive chunking: %s", file_path, e)
         raise
 
 async def process_file_semantic(file_path: str, file_extension: str, collection_name: str):
@@ -424,43 +842,21 @@ async def process_file_semantic(file_path: str, file_extension: str, collection_
     """
     try:
         # Parse the file based on its type
-        if file_extension == '.pdf':
-            logger.info(f"Processing PDF file: {file_path}")
-            documents = parse_pdf(file_path)
-        elif file_extension in ['.html', '.htm']:
-            logger.info(f"Processing HTML file: {file_path}")
-            documents = parse_html_file(file_path)
-        else:
-            logger.error(f"Unsupported file type: {file_extension}")
+        documents = await parse_file(file_path, file_extension)
+        if documents is None:
             return
         
-        logger.info(f"Parsed {len(documents)} documents from {file_path}")
-        
         # Chunk the documents
-        chunked_documents = semantic_chunker.chunk_documents(documents)
-        logger.info(f"Created {len(chunked_documents)} chunks")
-        
-        # Extract texts and metadata from chunks
-        texts = []
-        metadatas = []
-        for chunk in chunked_documents:
-            if isinstance(chunk, dict):
-                texts.append(chunk["content"])
-                metadatas.append(chunk.get("metadata", {}))
-            else:
-                texts.append(chunk.page_content)
-                metadatas.append(chunk.metadata)
-        
-        # Create collection and store documents
-        storage.create_collection(collection_name)
-        storage.store_documents(
-            collection_name=collection_name,
-            texts=texts,
-            embeddings=embeddings,
-            metadatas=metadatas
+        chunked_documents = await asyncio.get_running_loop().run_in_executor(
+            _CPU_POOL, semantic_chunker.chunk_documents, documents
         )
+        logger.info("Created %d chunks", len(chunked_documents))
         
-        logger.info(f"Successfully processed {file_path} with semantic chunking")
+        # Create collection unless it exists, then embed and store chunks
+        await async_storage.ensure_collection(collection_name)
+        await embed_and_store_chunks(chunked_documents, collection_name)
+        
+        logger.info("Successfully processed %s with semantic chunking", file_path)
     except Exception as e:
-        logger.error(f"Error processing {file_path} with semantic chunking: {e}")
-        raise 
\ No newline at end of file
+        logger.error("Error processing %s with semantic chunking: %s", file_path, e)
+        raise
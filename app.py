@@ -4,22 +4,35 @@ FastAPI application entry point.
 
 import os
 import logging
+import threading
+from contextlib import asynccontextmanager
 from typing import Dict, Any
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from api.routes import router
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging before importing the routes, which connect to their
+# services (and log it) at import time
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+from api.routes import router
+from src.embeddings.titan import get_embeddings
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the Bedrock client in the background so the first request skips it."""
+    threading.Thread(target=lambda: get_embeddings().bedrock_client, daemon=True).start()
+    yield
+
 # Create FastAPI app
 app = FastAPI(
     title="Semantic Document Chunking",
     description="API for semantic document chunking and RAG with enhanced table handling",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -37,7 +50,7 @@ app.include_router(router, prefix="/api")
 # Error handler for file uploads
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    logger.error(f"Error uploading file: {exc.status_code}: {exc.detail}")
+    logger.error("Error uploading file: %s: %s", exc.status_code, exc.detail)
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail}
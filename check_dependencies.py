@@ -4,53 +4,94 @@ Dependency checker for the Semantic Document Chunking and RAG application.
 This script checks if all required dependencies are properly installed.
 """
 
+import asyncio
 import importlib
-import subprocess
 import sys
 import os
 from pathlib import Path
 
-def check_python_package(package_name, min_version=None):
-    """Check if a Python package is installed and meets the minimum version requirement."""
+def probe_python_package(package_name):
+    """Import a Python package and return (package_name, version, installed)."""
     try:
         module = importlib.import_module(package_name)
-        if hasattr(module, '__version__'):
-            version = module.__version__
-        elif hasattr(module, 'version'):
-            version = module.version
-        else:
-            version = "Unknown"
-        
-        if min_version and version != "Unknown":
-            from packaging import version as packaging_version
-            if packaging_version.parse(version) < packaging_version.parse(min_version):
-                print(f"❌ {package_name} version {version} is installed, but version {min_version} or higher is required")
-                return False
-        
-        print(f"✅ {package_name} (version {version}) is installed")
-        return True
-    
     except ImportError:
+        return package_name, None, False
+    
+    if hasattr(module, '__version__'):
+        version = str(module.__version__)
+    elif hasattr(module, 'version'):
+        version = str(module.version)
+    else:
+        version = "Unknown"
+    
+    return package_name, version, True
+
+def report_python_package(package_name, version, installed, min_version=None):
+    """Print the result of a package probe and check the minimum version requirement."""
+    if not installed:
         print(f"❌ {package_name} is not installed")
         return False
-
-def check_system_dependency(command, name=None):
-    """Check if a system dependency is installed."""
-    if name is None:
-        name = command
     
-    try:
-        result = subprocess.run([command, '--version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        if result.returncode == 0:
-            version = result.stdout.strip() or result.stderr.strip()
-            print(f"✅ {name} is installed ({version})")
-            return True
-        else:
-            print(f"❌ {name} is not installed or not working properly")
+    if min_version and version != "Unknown":
+        from packaging import version as packaging_version
+        if packaging_version.parse(version) < packaging_version.parse(min_version):
+            print(f"❌ {package_name} version {version} is installed, but version {min_version} or higher is required")
             return False
+    
+    print(f"✅ {package_name} (version {version}) is installed")
+    return True
+
+def check_python_package(package_name, min_version=None):
+    """Check if a Python package is installed and meets the minimum version requirement."""
+    return report_python_package(*probe_python_package(package_name), min_version)
+
+def check_python_packages(packages):
+    """Check several Python packages, reporting every package rather than stopping at the first failure."""
+    return all([check_python_package(name, min_version) for name, min_version in packages])
+
+async def get_command_output(*args):
+    """Run a command and return (returncode, stdout, stderr), or None if it is not on PATH."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
     except FileNotFoundError:
+        return None
+    
+    stdout, stderr = await process.communicate()
+    return process.returncode, stdout.decode().strip(), stderr.decode().strip()
+
+def report_system_dependency(name, result):
+    """Print the result of a system dependency probe."""
+    if result is None:
         print(f"❌ {name} is not installed or not in PATH")
         return False
+    
+    returncode, stdout, stderr = result
+    if returncode == 0:
+        version = stdout or stderr
+        print(f"✅ {name} is installed ({version})")
+        return True
+    else:
+        print(f"❌ {name} is not installed or not working properly")
+        return False
+
+def check_system_dependencies(dependencies):
+    """Check several system dependencies, running their version commands concurrently."""
+    async def probe_all():
+        return await asyncio.gather(*(
+            get_command_output(command, '--version') for command, _ in dependencies
+        ))
+    
+    results = asyncio.run(probe_all())
+    return all([
+        report_system_dependency(name or command, result)
+        for (command, name), result in zip(dependencies, results)
+    ])
+
+def check_system_dependency(command, name=None):
+    """Check if a system dependency is installed."""
+    return check_system_dependencies([(command, name)])
 
 def check_aws_credentials():
     """Check if AWS credentials are properly configured."""
@@ -78,27 +119,27 @@ def check_aws_credentials():
 
 def check_docker():
     """Check if Docker is running and Qdrant container is available."""
-    try:
-        # Check if Docker is running
-        result = subprocess.run(['docker', 'ps'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        if result.returncode != 0:
-            print("❌ Docker is not running or not installed")
-            return False
-        
-        # Check if Qdrant container is running
-        result = subprocess.run(['docker', 'ps', '--filter', 'name=qdrant', '--format', '{{.Names}}'], 
-                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        if 'qdrant' not in result.stdout:
-            print("❌ Qdrant container is not running")
-            print("   Start it with: docker-compose up -d")
-            return False
-        
-        print("✅ Docker is running and Qdrant container is available")
-        return True
-    
-    except FileNotFoundError:
+    # A single filtered `docker ps` fails the same way as a bare one when Docker is down
+    result = asyncio.run(get_command_output(
+        'docker', 'ps', '--filter', 'name=qdrant', '--format', '{{.Names}}'
+    ))
+    if result is None:
         print("❌ Docker is not installed or not in PATH")
         return False
+    
+    returncode, stdout, _ = result
+    if returncode != 0:
+        print("❌ Docker is not running or not installed")
+        return False
+    
+    # Check if Qdrant container is running
+    if 'qdrant' not in stdout:
+        print("❌ Qdrant container is not running")
+        print("   Start it with: docker-compose up -d")
+        return False
+    
+    print("✅ Docker is running and Qdrant container is available")
+    return True
 
 def check_pdf_file():
     """Check if the sample PDF file exists."""
@@ -126,7 +167,7 @@ def main():
         ("python-dotenv", "1.0.0"),
         ("pydantic", "2.4.2"),
         ("pypdf", "3.17.1"),
-        ("qdrant_client", "1.6.4"),
+        ("qdrant_client", "1.10.0"),
         ("boto3", "1.28.64"),
         ("unstructured", "0.10.30"),
         ("sentence_transformers", "2.2.2"),
@@ -134,22 +175,24 @@ def main():
     ]
     
     print("Checking Python packages:")
-    python_packages_ok = all(check_python_package(package, version) for package, version in packages)
+    python_packages_ok = check_python_packages(packages)
     print()
     
     # Check system dependencies
     print("Checking system dependencies:")
     system_deps_ok = True
     if sys.platform == "darwin":  # macOS
-        system_deps_ok = all([
-            check_system_dependency("tesseract"),
-            check_system_dependency("pdfinfo", "poppler"),
-            # libmagic is usually available on macOS
+        # libmagic is usually available on macOS
+        system_deps_ok = check_system_dependencies([
+            ("tesseract", None),
+            ("pdfinfo", "poppler")
         ])
     elif sys.platform.startswith("linux"):  # Linux
         system_deps_ok = all([
-            check_system_dependency("tesseract"),
-            check_system_dependency("pdfinfo", "poppler"),
+            check_system_dependencies([
+                ("tesseract", None),
+                ("pdfinfo", "poppler")
+            ]),
             # Check if libmagic is installed
             check_python_package("magic")
         ])
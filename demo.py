@@ -1,6 +1,8 @@
 import argparse
+import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -18,11 +20,6 @@ if not os.getenv("AWS_ACCESS_KEY_ID") or not os.getenv("AWS_SECRET_ACCESS_KEY"):
     print("AWS_REGION=us-east-1")
     sys.exit(1)
 
-from src.chunking.recursive import RecursiveChunker
-from src.chunking.semantic import SemanticChunker
-from src.rag.query import RAGQuery
-from src.utils.pdf import process_pdf
-
 def main():
     """
     Demo script to demonstrate the application's functionality.
@@ -32,6 +29,8 @@ def main():
     parser.add_argument("--query", type=str, default="What are the key financial metrics mentioned in the report?", help="Query to search for")
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
     pdf_path = args.pdf
     query = args.query
     
@@ -39,6 +38,13 @@ def main():
         print(f"Error: PDF file '{pdf_path}' not found")
         return
     
+    # Import the pipeline only once the arguments are valid; it pulls in
+    # LangChain, boto3, qdrant-client and unstructured
+    from src.chunking.recursive import RecursiveChunker
+    from src.chunking.semantic import SemanticChunker
+    from src.rag.query import RAGQuery
+    from src.utils.pdf import process_pdf
+    
     print(f"Processing PDF: {pdf_path}")
     print("=" * 80)
     
@@ -49,17 +55,15 @@ def main():
         print(f"Extracted {len(pdf_data['structured_elements'])} structured elements")
         print("=" * 80)
         
-        # Process with recursive chunking
-        print("Processing with recursive chunking...")
-        recursive_chunker = RecursiveChunker()
-        recursive_chunks = recursive_chunker.process_and_store(pdf_data["raw_text"])
+        # Process with both chunking strategies concurrently; each is
+        # dominated by embedding and upload I/O
+        print("Processing with recursive and semantic chunking...")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            recursive_future = executor.submit(RecursiveChunker().process_and_store, pdf_data["raw_text"])
+            semantic_future = executor.submit(SemanticChunker().process_and_store, pdf_data["structured_elements"])
+            recursive_chunks = recursive_future.result()
+            semantic_chunks = semantic_future.result()
         print(f"Created {len(recursive_chunks)} recursive chunks")
-        print("=" * 80)
-        
-        # Process with semantic chunking
-        print("Processing with semantic chunking...")
-        semantic_chunker = SemanticChunker()
-        semantic_chunks = semantic_chunker.process_and_store(pdf_data["structured_elements"])
         print(f"Created {len(semantic_chunks)} semantic chunks")
         print("=" * 80)
         
@@ -1,21 +1,60 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
+from itertools import islice
+import hashlib
 import logging
+import re
+
+import diskcache
+import orjson
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
-from src.utils.config import load_config
 
-from src.embeddings.titan import TitanEmbeddings
-from src.storage.qdrant import QdrantStorage
+from src.embeddings.titan import get_embeddings
+from src.storage.qdrant import get_async_storage, get_storage
 from src.utils.config import (
     RECURSIVE_COLLECTION_NAME,
     RECURSIVE_CHUNK_SIZE,
-    RECURSIVE_CHUNK_OVERLAP
+    RECURSIVE_CHUNK_OVERLAP,
+    INGEST_BATCH_SIZE,
+    CHUNK_CACHE_DIR
 )
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# The splitter holds no per-call state, so one instance serves every chunker.
+# Chunks are left unstripped so their length locates the text they came from
+# (see iter_chunks); they are stripped before being yielded.
+_TEXT_SPLITTER = RecursiveCharacterTextSplitter(
+    chunk_size=RECURSIVE_CHUNK_SIZE,
+    chunk_overlap=RECURSIVE_CHUNK_OVERLAP,
+    length_function=len,
+    is_separator_regex=False,
+    strip_whitespace=False
+)
+
+# Separator documents are joined with before splitting
+_DOCUMENT_SEPARATOR = "\n\n"
+
+# Bump when chunking changes so cached chunks are not reused
+CHUNK_CACHE_VERSION = 2
+
+def _chunk_batches(chunks: Iterable[Dict], batch_size: int) -> Iterator[Tuple[List[str], List[Dict]]]:
+    """
+    Group chunks into batches of texts and metadata for storage.
+    
+    Args:
+        chunks: Chunks to group (any iterable)
+        batch_size: Number of chunks per batch
+        
+    Yields:
+        Tuples of texts and metadata dictionaries
+    """
+    iterator = iter(chunks)
+    for batch in iter(lambda: list(islice(iterator, batch_size)), []):
+        yield [chunk["content"] for chunk in batch], [chunk.get("metadata", {}) for chunk in batch]
+
 class RecursiveChunker:
     """
     Recursive chunking implementation using pure RecursiveCharacterTextSplitter.
@@ -23,16 +62,152 @@ class RecursiveChunker:
     
     def __init__(self):
         """Initialize the recursive chunker with configuration."""
-        self.chunk_size = int(load_config("RECURSIVE_CHUNK_SIZE", "1000"))
-        self.chunk_overlap = int(load_config("RECURSIVE_CHUNK_OVERLAP", "200"))
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            is_separator_regex=False
+        self.chunk_size = RECURSIVE_CHUNK_SIZE
+        self.chunk_overlap = RECURSIVE_CHUNK_OVERLAP
+        self.text_splitter = _TEXT_SPLITTER
+        self.embeddings = get_embeddings()
+        self.storage = get_storage()
+        self._chunk_cache = None
+    
+    @property
+    def chunk_cache(self) -> diskcache.Cache:
+        """
+        Lazy-open the on-disk chunk cache.
+        """
+        if self._chunk_cache is None:
+            self._chunk_cache = diskcache.Cache(CHUNK_CACHE_DIR)
+        return self._chunk_cache
+    
+    @staticmethod
+    def _document_content(doc: Any) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extract the text and metadata of a document.
+        
+        Args:
+            doc: Document object or dictionary
+            
+        Returns:
+            Tuple of text and metadata
+        """
+        if isinstance(doc, Document):
+            return doc.page_content, doc.metadata
+        return doc.get("text", ""), doc.get("metadata", {})
+    
+    def _cache_key(self, documents: List[Any]) -> str:
+        """
+        Build the chunk cache key for a list of documents.
+        
+        Args:
+            documents: Documents to chunk
+            
+        Returns:
+            SHA-256 of the documents' text and metadata, the splitter settings
+            and the cache version
+        """
+        digest = hashlib.sha256(
+            f"v{CHUNK_CACHE_VERSION}:{self.chunk_size}:{self.chunk_overlap}".encode("utf-8")
         )
-        self.embeddings = TitanEmbeddings()
-        self.storage = QdrantStorage()
+        for doc in documents:
+            text, metadata = self._document_content(doc)
+            digest.update(b"\0" + text.encode("utf-8"))
+            digest.update(b"\0" + orjson.dumps(
+                metadata, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            ))
+        return digest.hexdigest()
+    
+    def iter_chunks(self, documents: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily chunk documents using recursive character text splitting.
+        
+        Document texts are joined with blank lines and split as one text, so
+        chunks span documents and overlap as if the whole text were split at
+        once. Chunks are yielded once text following them has been read.
+        
+        All chunks carry the metadata of the first document that has any.
+        
+        Args:
+            documents: Documents to chunk
+            
+        Yields:
+            Chunked documents
+        """
+        buffer = None
+        base_metadata = {}
+        chunk_metadata = None
+        
+        def split(text: str, final: bool) -> Tuple[List[str], str]:
+            """Split text, returning the chunks that are complete and the text still open."""
+            pieces = self.text_splitter.split_text(text)
+            if final or not pieces:
+                return pieces, ""
+            
+            # The last top-level split may still be merged with what follows
+            # unless it was long enough to be split on its own
+            last_split = max(
+                (match.start() for match in re.finditer(_DOCUMENT_SEPARATOR, text)),
+                default=0
+            )
+            if len(text) - last_split >= self.chunk_size:
+                return pieces, ""
+            
+            # The last chunk ends the text; resplitting it with what follows
+            # reproduces the splitter's state
+            return pieces[:-1], text[-len(pieces[-1]):]
+        
+        for doc in documents:
+            text, metadata = self._document_content(doc)
+            if not base_metadata:
+                base_metadata = metadata
+            
+            if not text.strip():
+                continue
+            
+            if buffer is None:
+                buffer = text
+                continue
+            buffer = f"{buffer}{_DOCUMENT_SEPARATOR}{text}"
+            
+            # Wait for the metadata, and for a buffer that can no longer be
+            # split differently by a separator straddling its end
+            if len(buffer) <= self.chunk_size or not base_metadata or buffer.endswith("\n"):
+                continue
+            
+            if chunk_metadata is None:
+                # Chunks share a single (read-only) metadata dict
+                chunk_metadata = self._chunk_metadata(base_metadata)
+            pieces, buffer = split(buffer, final=False)
+            for piece in pieces:
+                piece = piece.strip()
+                if piece:
+                    yield {"content": piece, "metadata": chunk_metadata}
+        
+        if buffer is None:
+            return
+        
+        if chunk_metadata is None:
+            chunk_metadata = self._chunk_metadata(base_metadata)
+        pieces, _ = split(buffer, final=True)
+        for piece in pieces:
+            piece = piece.strip()
+            if piece:
+                yield {"content": piece, "metadata": chunk_metadata}
+    
+    def _chunk_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the metadata attached to recursive chunks.
+        
+        Args:
+            metadata: Metadata of the source documents
+            
+        Returns:
+            Chunk metadata
+        """
+        return {
+            **metadata,
+            "chunking_type": "recursive",
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap
+        }
     
     def chunk_documents(self, documents: List[Any]) -> List[Dict[str, Any]]:
         """
@@ -46,81 +221,73 @@ class RecursiveChunker:
             List of chunked documents
         """
         try:
-            all_text = []
-            base_metadata = {}
-            
-            # Concatenate all document content with newlines
-            for doc in documents:
-                if isinstance(doc, Document):
-                    all_text.append(doc.page_content)
-                    # Keep track of common metadata
-                    if not base_metadata:
-                        base_metadata = doc.metadata
-                else:
-                    all_text.append(doc.get("text", ""))
-                    if not base_metadata:
-                        base_metadata = doc.get("metadata", {})
-            
-            # Join all text with double newlines to preserve some structure
-            combined_text = "\n\n".join(text for text in all_text if text.strip())
-            
-            # Create chunks from the combined text
-            chunks = self.text_splitter.create_documents(
-                texts=[combined_text],
-                metadatas=[{
-                    **base_metadata,
-                    "chunking_type": "recursive",
-                    "chunk_size": self.chunk_size,
-                    "chunk_overlap": self.chunk_overlap
-                }]
-            )
+            chunked_documents = list(self.iter_chunks(documents))
             
-            # Convert to consistent format
-            chunked_documents = []
-            for chunk in chunks:
-                chunked_documents.append({
-                    "content": chunk.page_content,
-                    "metadata": chunk.metadata
-                })
-            
-            logger.info(f"Created {len(chunked_documents)} chunks using recursive chunking")
+            logger.info("Created %d chunks using recursive chunking", len(chunked_documents))
             return chunked_documents
             
         except Exception as e:
-            logger.error(f"Error chunking documents: {e}")
+            logger.error("Error chunking documents: %s", e)
             raise
     
-    def store_chunks(self, chunks: List[Dict], collection_name: Optional[str] = None) -> None:
+    def store_chunks(self, chunks: Iterable[Dict], collection_name: Optional[str] = None) -> None:
         """
         Store chunks in Qdrant.
         
+        Chunks are consumed in batches, so a generator is never fully
+        materialized; each batch is uploaded while the next one is embedded.
+        
         Args:
-            chunks: List of chunks
+            chunks: Chunks to store (any iterable)
             collection_name: Optional custom collection name
         """
         try:
             if collection_name is None:
                 collection_name = RECURSIVE_COLLECTION_NAME
             
-            # Extract texts and metadata
-            texts = []
-            metadatas = []
-            for chunk in chunks:
-                texts.append(chunk["content"])
-                metadatas.append(chunk.get("metadata", {}))
-            
-            # Store in Qdrant
-            self.storage.store_documents(
-                collection_name=collection_name,
-                texts=texts,
-                embeddings=self.embeddings,
-                metadatas=metadatas
+            stored = self.storage.store_batches(
+                collection_name, _chunk_batches(chunks, INGEST_BATCH_SIZE), self.embeddings.embed_documents_cached
+            )
+            
+            logger.info("Stored %d chunks in collection '%s'", stored, collection_name)
+            
+        except Exception as e:
+            logger.error("Error storing chunks: %s", e)
+            raise
+    
+    async def astore_chunks(
+        self,
+        chunks: Iterable[Dict],
+        collection_name: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ) -> None:
+        """
+        Store chunks in Qdrant without blocking the event loop.
+        
+        Chunks are consumed in batches, so a generator is never fully
+        materialized. Each batch is embedded in a worker thread while the
+        previous one is upserted through the shared async client, so this
+        must run on the application's event loop; synchronous callers use
+        store_chunks.
+        
+        Args:
+            chunks: Chunks to store (any iterable)
+            collection_name: Optional custom collection name
+            batch_size: Number of chunks embedded and stored at a time
+        """
+        if collection_name is None:
+            collection_name = RECURSIVE_COLLECTION_NAME
+        batch_size = batch_size or INGEST_BATCH_SIZE
+        
+        try:
+            stored = await get_async_storage().store_batches(
+                collection_name, _chunk_batches(chunks, batch_size), self.embeddings.embed_documents_cached
             )
             
-            logger.info(f"Stored {len(chunks)} chunks in collection '{collection_name}'")
+            logger.info("Stored %d chunks in collection '%s'", stored, collection_name)
             
         except Exception as e:
-            logger.error(f"Error storing chunks: {e}")
+            logger.error("Error storing chunks: %s", e)
             raise
     
     def process_and_store(self, elements: List[Dict], collection_name: Optional[str] = None) -> List[Dict]:
@@ -136,14 +303,27 @@ class RecursiveChunker:
             List of processed chunks
         """
         try:
-            # Create chunks
-            chunks = self.chunk_documents(elements)
+            # Reuse chunks of previously processed content
+            cache_key = self._cache_key(elements)
+            cached_chunks = self.chunk_cache.get(cache_key)
+            if cached_chunks is not None:
+                logger.info("Loaded %d chunks from cache", len(cached_chunks))
+                self.store_chunks(cached_chunks, collection_name)
+                return cached_chunks
+            
+            # Stream chunks into storage as they are created
+            chunks = []
+            
+            def collect(chunk_iterator: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+                for chunk in chunk_iterator:
+                    chunks.append(chunk)
+                    yield chunk
             
-            # Store chunks
-            self.store_chunks(chunks, collection_name)
+            self.store_chunks(collect(self.iter_chunks(elements)), collection_name)
+            self.chunk_cache.set(cache_key, chunks)
             
             return chunks
             
         except Exception as e:
-            logger.error(f"Error in process_and_store: {e}")
+            logger.error("Error in process_and_store: %s", e)
             raise 
\ No newline at end of file
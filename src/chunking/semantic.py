@@ -1,9 +1,15 @@
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
+from functools import lru_cache
 import re
 import json
+import hashlib
 import logging
+from itertools import zip_longest
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import orjson
 import pandas as pd
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
@@ -15,18 +21,92 @@ from unstructured.documents.elements import (
     ListItem
 )
 
-from src.embeddings.titan import TitanEmbeddings
-from src.storage.qdrant import QdrantStorage
+from src.embeddings.titan import get_embeddings
+from src.utils.html_parser import BS4_PARSER, table_rows
+from src.storage.qdrant import get_storage
 from src.utils.config import (
     SEMANTIC_COLLECTION_NAME,
     SEMANTIC_CHUNK_SIZE,
     SEMANTIC_CHUNK_OVERLAP,
+    CHUNK_WORKERS,
+    CHUNK_PARALLEL_MIN_CHARS,
+    INGEST_BATCH_SIZE,
     load_config
 )
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Case-insensitive HTML marker; searching avoids lowercasing a copy of the content
+_HTML_RE = re.compile(r'<html', re.IGNORECASE)
+
+# Text tags grouped into sections when chunking HTML documents
+_TEXT_TAGS = frozenset(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li'])
+
+# Only tables and text tags are used when chunking HTML documents
+_HTML_STRAINER = SoupStrainer(['table', *sorted(_TEXT_TAGS)])
+
+# Heading tag names mapped to their level
+_HEADING_LEVELS = {f"h{i}": i for i in range(1, 7)}
+
+@lru_cache(maxsize=None)
+def _chunk_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool used to chunk documents in parallel.
+    
+    Workers are spawned rather than forked since the API calls into the
+    chunker from threads.
+    
+    Returns:
+        ProcessPoolExecutor instance
+    """
+    return ProcessPoolExecutor(max_workers=CHUNK_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+def _table_records(headers: List[str], rows: List[List[str]]) -> List[Dict[str, Optional[str]]]:
+    """
+    Build table records keyed by header (or column position).
+    
+    Matches what a DataFrame of the rows serialized with
+    ``to_json(orient='records')`` would give: short rows are padded with
+    None, and a row width that differs from the headers or duplicate
+    headers are errors.
+    
+    Args:
+        headers: Column headers, possibly empty
+        rows: Table rows of cell text
+        
+    Returns:
+        List of records
+    """
+    data_width = max((len(row) for row in rows), default=0)
+    if headers:
+        if rows and data_width != len(headers):
+            raise ValueError(f"{len(headers)} columns passed, passed data had {data_width} columns")
+        if len(set(headers)) != len(headers):
+            raise ValueError("DataFrame columns must be unique for orient='records'.")
+        columns = headers
+    else:
+        columns = [str(i) for i in range(data_width)]
+    
+    return [
+        dict(zip(columns, row + [None] * (len(columns) - len(row))))
+        for row in rows
+    ]
+
+@lru_cache(maxsize=1024)
+def _split_text_cached(text_splitter: RecursiveCharacterTextSplitter, text: str) -> Tuple[str, ...]:
+    """
+    Split text, reusing the result for text seen before (e.g. repeated boilerplate sections).
+    
+    Args:
+        text_splitter: Splitter to use
+        text: Text to split
+        
+    Returns:
+        Tuple of chunk texts
+    """
+    return tuple(text_splitter.split_text(text))
+
 class SemanticChunker:
     """
     Semantic chunking implementation with enhanced table handling.
@@ -42,8 +122,38 @@ class SemanticChunker:
             length_function=len,
             is_separator_regex=False
         )
-        self.embeddings = TitanEmbeddings()
-        self.storage = QdrantStorage()
+    
+    @property
+    def embeddings(self):
+        """
+        Get the shared embeddings; not stored on the instance so the chunker
+        can be pickled to worker processes.
+        """
+        return get_embeddings()
+    
+    @property
+    def storage(self):
+        """
+        Get the shared Qdrant storage; not stored on the instance so the
+        chunker can be pickled to worker processes.
+        """
+        return get_storage()
+    
+    def _create_documents(self, text: str, metadata: Dict[str, Any]) -> List[Document]:
+        """
+        Split text into Documents that each carry a copy of the metadata.
+        
+        Args:
+            text: Text to split
+            metadata: Metadata for every chunk
+            
+        Returns:
+            List of chunk Documents
+        """
+        return [
+            Document(page_content=piece, metadata=dict(metadata))
+            for piece in _split_text_cached(self.text_splitter, text)
+        ]
     
     def extract_table_from_html(self, table_element) -> Dict:
         """
@@ -58,31 +168,28 @@ class SemanticChunker:
         try:
             # Extract headers
             headers = []
-            header_row = table_element.find('thead')
+            header_row = table_element.find('thead', recursive=False)
             if header_row:
                 headers = [th.get_text(strip=True) for th in header_row.find_all(['th', 'td'])]
             
             # Extract rows
             rows = []
-            for tr in table_element.find_all('tr'):
-                row = [td.get_text(strip=True) for td in tr.find_all(['td', 'th'])]
+            for tr in table_rows(table_element):
+                row = [td.get_text(strip=True) for td in tr.find_all(['td', 'th'], recursive=False)]
                 if row and row != headers:  # Skip header row if we already got it
                     rows.append(row)
             
-            # Create DataFrame
-            df = pd.DataFrame(rows, columns=headers if headers else None)
-            
             # Convert to structured format
             table_data = {
                 "headers": headers,
                 "rows": rows,
-                "records": json.loads(df.to_json(orient='records'))
+                "records": _table_records(headers, rows)
             }
             
             return table_data
             
         except Exception as e:
-            logger.warning(f"Failed to extract table data: {e}")
+            logger.warning("Failed to extract table data: %s", e)
             return {
                 "headers": headers if 'headers' in locals() else [],
                 "rows": rows if 'rows' in locals() else [],
@@ -113,46 +220,42 @@ class SemanticChunker:
             
             # Add rows
             text_parts.append("\nTable Data:")
-            max_cols = max(len(row) for row in table_data["rows"]) if table_data["rows"] else 0
             
-            # Pad rows to have equal length
-            padded_rows = []
-            for row in table_data["rows"]:
-                padded_row = row + [""] * (max_cols - len(row))
-                padded_rows.append(padded_row)
+            # Transpose into columns, padding short rows
+            cols = list(zip_longest(*table_data["rows"], fillvalue=""))
+            max_cols = len(cols)
             
-            # Create DataFrame with padded rows
+            # Create DataFrame from the columns
             try:
                 if table_data["headers"] and len(table_data["headers"]) == max_cols:
-                    df = pd.DataFrame(padded_rows, columns=table_data["headers"])
+                    columns = table_data["headers"]
                 else:
                     # Create default column names if headers don't match
                     columns = [f"Column_{i+1}" for i in range(max_cols)]
-                    df = pd.DataFrame(padded_rows, columns=columns)
+                df = pd.DataFrame(dict(enumerate(cols)), index=pd.RangeIndex(len(table_data["rows"])))
+                df.columns = columns
                 
                 # Add DataFrame records to table data
-                table_data["records"] = json.loads(df.to_json(orient='records'))
+                table_data["records"] = orjson.loads(df.to_json(orient='records'))
                 
                 # Add basic statistics for numeric columns
+                # (duplicate column names are ambiguous and get no statistics)
                 table_data["statistics"] = {}
-                for column in df.columns:
-                    try:
-                        numeric_series = pd.to_numeric(df[column], errors='coerce')
-                        if not numeric_series.isna().all():
-                            table_data["statistics"][column] = {
-                                "min": float(numeric_series.min()),
-                                "max": float(numeric_series.max()),
-                                "mean": float(numeric_series.mean()),
-                                "sum": float(numeric_series.sum())
-                            }
-                    except:
-                        continue
+                numeric_df = df.loc[:, ~df.columns.duplicated(keep=False)]
+                if not numeric_df.columns.empty:
+                    numeric_df = numeric_df.apply(pd.to_numeric, errors='coerce')
+                    numeric_df = numeric_df.loc[:, numeric_df.notna().any()]
+                if not numeric_df.columns.empty:
+                    table_data["statistics"] = {
+                        column: {stat: float(value) for stat, value in column_stats.items()}
+                        for column, column_stats in numeric_df.agg(['min', 'max', 'mean', 'sum']).to_dict().items()
+                    }
                 
             except Exception as e:
-                logger.warning(f"Error creating DataFrame: {e}")
+                logger.warning("Error creating DataFrame: %s", e)
             
             # Format rows for text representation
-            for row in padded_rows:
+            for row in zip(*cols):
                 text_parts.append(" | ".join(str(cell) for cell in row))
             
             return {
@@ -166,7 +269,7 @@ class SemanticChunker:
             }
             
         except Exception as e:
-            logger.error(f"Error processing table: {e}")
+            logger.error("Error processing table: %s", e)
             # Return a minimal document if table processing fails
             return {
                 "content": table_element.get_text(),
@@ -178,125 +281,154 @@ class SemanticChunker:
                 }
             }
     
-    def chunk_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _chunk_document(self, doc: Union[Document, Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Chunk documents using semantic understanding.
+        Chunk a single document using semantic understanding.
         
         Args:
-            documents: List of documents to chunk
+            doc: Document to chunk
             
         Returns:
             List of chunked documents
         """
-        try:
-            chunked_documents = []
-            
-            for doc in documents:
-                # Handle both Document objects and dictionaries
-                if isinstance(doc, Document):
-                    content = doc.page_content
-                    metadata = doc.metadata
-                else:
-                    content = doc["content"]
-                    metadata = doc.get("metadata", {})
-                
-                # Check if content is HTML
-                if metadata.get("content_type") == "text/html" or "<html" in content.lower():
-                    soup = BeautifulSoup(content, 'html.parser')
-                    
-                    # Process tables
-                    tables = soup.find_all('table')
-                    logger.info(f"Found {len(tables)} tables in document")
-                    for i, table in enumerate(tables):
-                        try:
-                            table_doc = self.process_table(table, {
-                                **metadata,
-                                "table_index": i,
-                                "total_tables": len(tables)
-                            })
-                            chunked_documents.append(table_doc)
-                        except Exception as e:
-                            logger.warning(f"Error processing table {i}: {e}")
-                    
-                    # Process text elements
-                    text_elements = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li'])
-                    logger.info(f"Found {len(text_elements)} text elements in document")
-                    
-                    # Group text elements by section
-                    current_section = {"title": "", "content": [], "type": ""}
-                    sections = []
-                    
-                    for element in text_elements:
-                        text = element.get_text(strip=True)
-                        if not text:  # Skip empty elements
-                            continue
-                            
-                        # Check if this is a heading
-                        if element.name.startswith('h'):
-                            # Save previous section if it exists
-                            if current_section["content"]:
-                                sections.append(current_section.copy())
-                            
-                            # Start new section
-                            current_section = {
-                                "title": text,
-                                "content": [text],
-                                "type": "section",
-                                "level": int(element.name[1])
-                            }
-                        else:
-                            # Add to current section
-                            current_section["content"].append(text)
+        chunked_documents = []
+        
+        # Handle both Document objects and dictionaries
+        if isinstance(doc, Document):
+            content = doc.page_content
+            metadata = doc.metadata
+        else:
+            content = doc["content"]
+            metadata = doc.get("metadata", {})
+        
+        # Check if content is HTML
+        if metadata.get("content_type") == "text/html" or _HTML_RE.search(content):
+            soup = BeautifulSoup(content, BS4_PARSER, parse_only=_HTML_STRAINER)
+            
+            # Process tables
+            tables = soup.find_all('table')
+            logger.info("Found %d tables in document", len(tables))
+            for i, table in enumerate(tables):
+                try:
+                    table_doc = self.process_table(table, {
+                        **metadata,
+                        "table_index": i,
+                        "total_tables": len(tables)
+                    })
+                    chunked_documents.append(table_doc)
+                except Exception as e:
+                    logger.warning("Error processing table %s: %s", i, e)
+            
+            # Process text elements (one set probe per tag is cheaper than
+            # matching the tag against a list of names)
+            text_elements = soup.find_all(lambda tag: tag.name in _TEXT_TAGS)
+            logger.info("Found %d text elements in document", len(text_elements))
+            
+            # Group text elements by section
+            current_section = {"title": "", "content": [], "type": ""}
+            sections = []
+            
+            for element in text_elements:
+                text = element.get_text(strip=True)
+                if not text:  # Skip empty elements
+                    continue
                     
-                    # Add the last section
+                # Check if this is a heading
+                level = _HEADING_LEVELS.get(element.name)
+                if level is not None:
+                    # Save previous section if it exists
                     if current_section["content"]:
                         sections.append(current_section)
                     
-                    # Process each section
-                    for i, section in enumerate(sections):
-                        section_text = "\n".join(section["content"])
-                        
-                        # Create chunks from section
-                        section_chunks = self.text_splitter.create_documents(
-                            texts=[section_text],
-                            metadatas=[{
-                                **metadata,
-                                "type": "section",
-                                "section_title": section["title"],
-                                "section_index": i,
-                                "total_sections": len(sections),
-                                "chunking_type": "semantic"
-                            }]
-                        )
-                        
-                        # Convert Document objects to dictionaries
-                        for chunk in section_chunks:
-                            chunked_documents.append({
-                                "content": chunk.page_content,
-                                "metadata": chunk.metadata
-                            })
+                    # Start new section
+                    current_section = {
+                        "title": text,
+                        "content": [text],
+                        "type": "section",
+                        "level": level
+                    }
                 else:
-                    # For non-HTML content, create semantic chunks
-                    chunks = self.text_splitter.create_documents(
-                        texts=[content],
-                        metadatas=[{
-                            **metadata,
-                            "chunking_type": "semantic"
-                        }]
-                    )
-                    
-                    # Convert Document objects to dictionaries
-                    for chunk in chunks:
-                        chunked_documents.append({
-                            "content": chunk.page_content,
-                            "metadata": chunk.metadata
-                        })
-            
-            logger.info(f"Created {len(chunked_documents)} chunks from {len(documents)} documents")
+                    # Add to current section
+                    current_section["content"].append(text)
+            
+            # Add the last section
+            if current_section["content"]:
+                sections.append(current_section)
+            
+            # Process each section
+            for i, section in enumerate(sections):
+                section_text = "\n".join(section["content"])
+                
+                # Create chunks from section
+                section_chunks = self._create_documents(
+                    section_text,
+                    {
+                        **metadata,
+                        "type": "section",
+                        "section_title": section["title"],
+                        "section_index": i,
+                        "total_sections": len(sections),
+                        "chunking_type": "semantic"
+                    }
+                )
+                
+                # Convert Document objects to dictionaries
+                for chunk in section_chunks:
+                    chunked_documents.append({
+                        "content": chunk.page_content,
+                        "metadata": chunk.metadata
+                    })
+        else:
+            # For non-HTML content, create semantic chunks
+            chunks = self._create_documents(
+                content,
+                {
+                    **metadata,
+                    "chunking_type": "semantic"
+                }
+            )
+            
+            # Convert Document objects to dictionaries
+            for chunk in chunks:
+                chunked_documents.append({
+                    "content": chunk.page_content,
+                    "metadata": chunk.metadata
+                })
+        
+        return chunked_documents
+    
+    def chunk_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Chunk documents using semantic understanding.
+        
+        Documents are chunked in parallel worker processes when more than one
+        worker is configured and there are at least CHUNK_PARALLEL_MIN_CHARS
+        characters of content. Each worker receives documents in a few
+        large batches rather than one at a time.
+        
+        Args:
+            documents: List of documents to chunk
+            
+        Returns:
+            List of chunked documents
+        """
+        try:
+            parallel = CHUNK_WORKERS > 1 and len(documents) > 1 and sum(
+                len(doc.page_content if isinstance(doc, Document) else doc["content"])
+                for doc in documents
+            ) >= CHUNK_PARALLEL_MIN_CHARS
+            if parallel:
+                chunksize = -(-len(documents) // (CHUNK_WORKERS * 4))
+                results = _chunk_pool().map(self._chunk_document, documents, chunksize=chunksize)
+            else:
+                results = map(self._chunk_document, documents)
+            chunked_documents = [chunk for chunks in results for chunk in chunks]
+            
+            logger.info("Created %d chunks from %d documents", len(chunked_documents), len(documents))
             return chunked_documents
             
         except Exception as e:
-            logger.error(f"Error chunking documents: {e}")
+            logger.error("Error chunking documents: %s", e)
             raise
     
     def create_table_chunks(self, table_data: Dict, metadata: Dict) -> List[Document]:
@@ -320,20 +452,21 @@ class SemanticChunker:
         }
         
         # 1. Create a chunk for the full table in human-readable format
-        readable_content = f"TABLE:\n"
+        readable_parts = ["TABLE:"]
         
         # Add headers
+        header_line = None
         if "headers" in table_data and table_data["headers"]:
-            readable_content += " | ".join(table_data["headers"]) + "\n"
-            readable_content += "-" * (len(readable_content) - 1) + "\n"
+            header_line = " | ".join(table_data["headers"])
+            readable_parts.append(header_line)
+            readable_parts.append("-" * (len("TABLE:\n") + len(header_line)))
         
         # Add rows
         if "rows" in table_data and table_data["rows"]:
-            for row in table_data["rows"]:
-                readable_content += " | ".join(row) + "\n"
+            readable_parts.extend(" | ".join(row) for row in table_data["rows"])
         
         chunks.append(Document(
-            page_content=readable_content,
+            page_content="\n".join(readable_parts) + "\n",
             metadata={
                 **base_metadata,
                 "table_format": "readable",
@@ -369,18 +502,17 @@ class SemanticChunker:
                         numeric_values = [float(v) if v and v.strip() else 0 for v in col_values if v]
                         if numeric_values:
                             # Create a specialized chunk for this column
-                            col_content = f"COLUMN DATA: {col_name}\n\n"
-                            col_content += f"Values: {numeric_values}\n"
+                            col_parts = [f"COLUMN DATA: {col_name}\n", f"Values: {numeric_values}"]
                             
                             # Calculate basic statistics
                             if len(numeric_values) > 0:
-                                col_content += f"Min: {min(numeric_values)}\n"
-                                col_content += f"Max: {max(numeric_values)}\n"
-                                col_content += f"Average: {sum(numeric_values)/len(numeric_values)}\n"
-                                col_content += f"Sum: {sum(numeric_values)}\n"
+                                col_parts.append(f"Min: {min(numeric_values)}")
+                                col_parts.append(f"Max: {max(numeric_values)}")
+                                col_parts.append(f"Average: {sum(numeric_values)/len(numeric_values)}")
+                                col_parts.append(f"Sum: {sum(numeric_values)}")
                             
                             chunks.append(Document(
-                                page_content=col_content,
+                                page_content="\n".join(col_parts) + "\n",
                                 metadata={
                                     **base_metadata,
                                     "table_format": "column",
@@ -399,9 +531,12 @@ class SemanticChunker:
                     except (ValueError, TypeError):
                         # Not numeric, create a text-based column chunk
                         if col_values and any(col_values):
-                            col_content = f"COLUMN DATA: {col_name}\n\n"
-                            col_content += f"Values: {col_values}\n"
-                            col_content += f"Unique values: {len(set(v for v in col_values if v))}\n"
+                            unique_values = list(dict.fromkeys(v for v in col_values if v))
+                            col_content = (
+                                f"COLUMN DATA: {col_name}\n\n"
+                                f"Values: {col_values}\n"
+                                f"Unique values: {len(unique_values)}\n"
+                            )
                             
                             chunks.append(Document(
                                 page_content=col_content,
@@ -411,21 +546,20 @@ class SemanticChunker:
                                     "table_purpose": "analysis",
                                     "column_name": col_name,
                                     "is_numeric": False,
-                                    "unique_values": list(set(v for v in col_values if v))[:10]  # Limit to 10 values
+                                    "unique_values": unique_values[:10]  # Limit to 10 values
                                 }
                             ))
         
         # 4. Create a chunk with statistical information if available
         if "statistics" in table_data and table_data["statistics"]:
-            stats_content = "TABLE STATISTICS:\n"
+            stats_parts = ["TABLE STATISTICS:"]
             
             for col, stats in table_data["statistics"].items():
-                stats_content += f"\n{col}:\n"
-                for stat_name, stat_value in stats.items():
-                    stats_content += f"  - {stat_name}: {stat_value}\n"
+                stats_parts.append(f"\n{col}:")
+                stats_parts.extend(f"  - {stat_name}: {stat_value}" for stat_name, stat_value in stats.items())
             
             chunks.append(Document(
-                page_content=stats_content,
+                page_content="\n".join(stats_parts) + "\n",
                 metadata={
                     **base_metadata,
                     "table_format": "statistics",
@@ -436,22 +570,24 @@ class SemanticChunker:
         
         # 5. Create a semantic description of the table
         if "headers" in table_data and "rows" in table_data:
-            description = f"This table contains {len(table_data['rows'])} rows and {len(table_data['headers'])} columns. "
-            description += f"The columns are: {', '.join(table_data['headers'])}. "
+            description_parts = [
+                f"This table contains {len(table_data['rows'])} rows and {len(table_data['headers'])} columns. ",
+                f"The columns are: {', '.join(table_data['headers'])}. "
+            ]
             
             # Add information about numeric columns
             if "statistics" in table_data:
                 numeric_cols = list(table_data["statistics"].keys())
                 if numeric_cols:
-                    description += f"The table contains numeric data in columns: {', '.join(numeric_cols)}. "
+                    description_parts.append(f"The table contains numeric data in columns: {', '.join(numeric_cols)}. ")
                     
                     # Add key statistics for important columns
                     for col, stats in table_data["statistics"].items():
                         if "sum" in stats and "mean" in stats:
-                            description += f"The sum of {col} is {stats['sum']} with an average of {stats['mean']}. "
+                            description_parts.append(f"The sum of {col} is {stats['sum']} with an average of {stats['mean']}. ")
             
             chunks.append(Document(
-                page_content=description,
+                page_content="".join(description_parts),
                 metadata={
                     **base_metadata,
                     "table_format": "description",
@@ -463,28 +599,31 @@ class SemanticChunker:
         if "records" in table_data and table_data["records"] and len(table_data["records"]) > 10:
             # Group rows into smaller chunks for better retrieval
             row_chunk_size = 5  # Number of rows per chunk
+            header_keys = table_data["headers"]
             for i in range(0, len(table_data["records"]), row_chunk_size):
                 row_group = table_data["records"][i:i+row_chunk_size]
                 
                 # Create content for this group of rows
-                row_content = f"TABLE ROWS {i+1} to {i+len(row_group)}:\n\n"
+                title = f"TABLE ROWS {i+1} to {i+len(row_group)}:\n"
+                row_parts = [title]
                 
                 # Add headers
-                if "headers" in table_data and table_data["headers"]:
-                    row_content += " | ".join(table_data["headers"]) + "\n"
-                    row_content += "-" * len(row_content) + "\n"
+                if header_line is not None:
+                    row_parts.append(header_line)
+                    row_parts.append("-" * (len(title) + 2 + len(header_line)))
                 
                 # Add the rows in this group
-                for row_dict in row_group:
-                    row_values = [str(row_dict.get(h, "")) for h in table_data["headers"]]
-                    row_content += " | ".join(row_values) + "\n"
+                row_parts.extend(
+                    " | ".join([str(row_dict.get(h, "")) for h in header_keys])
+                    for row_dict in row_group
+                )
                 
                 # Add as JSON for structured access
                 row_json = json.dumps(row_group, indent=2)
-                row_content += f"\nJSON:\n{row_json}"
+                row_parts.append(f"\nJSON:\n{row_json}")
                 
                 chunks.append(Document(
-                    page_content=row_content,
+                    page_content="\n".join(row_parts),
                     metadata={
                         **base_metadata,
                         "table_format": "row_group",
@@ -494,7 +633,7 @@ class SemanticChunker:
                     }
                 ))
         
-        logger.info(f"Created {len(chunks)} specialized chunks for table {metadata.get('table_id', 'unknown')}")
+        logger.info("Created %d specialized chunks for table %s", len(chunks), metadata.get('table_id', 'unknown'))
         return chunks
     
     def process_table(self, table: Dict) -> List[Document]:
@@ -510,15 +649,21 @@ class SemanticChunker:
         # Extract table HTML if available
         html_content = table["metadata"].get("html", "")
         
-        # Default metadata
+        # Default metadata; the ID is derived from the table content so it is
+        # stable across runs and identical tables share it
+        page_number = table["metadata"].get("page_number", 0)
+        content_hash = hashlib.blake2b(
+            (html_content or table.get("text", "")).encode("utf-8"), digest_size=8
+        ).hexdigest()
         metadata = {
-            "page_number": table["metadata"].get("page_number", 0),
-            "table_id": f"table_{table['metadata'].get('page_number', 0)}_{id(table)}"
+            "page_number": page_number,
+            "table_id": f"table_{page_number}_{content_hash}"
         }
         
         # If HTML is available, extract structured data
         if html_content:
-            structured_data = self.extract_table_from_html(BeautifulSoup(html_content, 'html.parser'))
+            soup = BeautifulSoup(html_content, BS4_PARSER, parse_only=SoupStrainer('table'))
+            structured_data = self.extract_table_from_html(soup.find('table') or soup)
             
             # Create multiple specialized chunks from the table data
             return self.create_table_chunks(structured_data, metadata)
@@ -560,12 +705,12 @@ class SemanticChunker:
         
         # Process tables separately to preserve structure
         if "Table" in grouped_elements:
-            logger.info(f"Processing {len(grouped_elements['Table'])} tables")
+            logger.info("Processing %d tables", len(grouped_elements['Table']))
             for table in grouped_elements["Table"]:
                 # Create multiple specialized chunks for each table
                 table_chunks = self.process_table(table)
                 chunks.extend(table_chunks)
-                logger.info(f"Created {len(table_chunks)} chunks for table")
+                logger.info("Created %d chunks for table", len(table_chunks))
         
         # Process titles and narrative text for semantic chunking
         text_elements = []
@@ -582,42 +727,48 @@ class SemanticChunker:
             x["metadata"].get("coordinates", {}).get("y", 0) if isinstance(x["metadata"].get("coordinates"), dict) else 0
         ))
         
-        logger.info(f"Processing {len(text_elements)} text elements")
+        logger.info("Processing %d text elements", len(text_elements))
         
-        # Process text elements by section
-        current_section = {"title": "", "content": "", "page": 0}
+        # Process text elements by section, collecting each section's parts
+        # and joining them once (repeated += on a dict value copies every time)
+        current_section = {"title": "", "parts": [], "page": 0}
         sections = []
         
+        def close_section(section: Dict[str, Any]) -> None:
+            if any(section["parts"]):
+                sections.append({
+                    "title": section["title"],
+                    "content": "\n\n".join(section["parts"]),
+                    "page": section["page"]
+                })
+        
         for element in text_elements:
             page_num = element["metadata"].get("page_number", 0)
             
             if element["type"] == "Title":
                 # If we have content in the current section, save it
-                if current_section["content"]:
-                    sections.append(current_section.copy())
+                close_section(current_section)
                 
                 # Start a new section
                 current_section = {
                     "title": element["text"],
-                    "content": element["text"],
+                    "parts": [element["text"]],
                     "page": page_num
                 }
             else:
                 # Add content to current section
-                if current_section["content"]:
-                    current_section["content"] += f"\n\n{element['text']}"
-                else:
-                    current_section["content"] = element["text"]
+                if not any(current_section["parts"]):
+                    current_section["parts"] = []
                     current_section["page"] = page_num
+                current_section["parts"].append(element["text"])
         
         # Add the last section if it has content
-        if current_section["content"]:
-            sections.append(current_section)
+        close_section(current_section)
         
         # If no sections were created (e.g., from fallback parser with no titles)
         # create a single section from all text elements
         if not sections and text_elements:
-            all_text = "\n\n".join([element["text"] for element in text_elements])
+            all_text = "\n\n".join(element["text"] for element in text_elements)
             page_num = text_elements[0]["metadata"].get("page_number", 0) if text_elements else 0
             
             sections.append({
@@ -626,26 +777,26 @@ class SemanticChunker:
                 "page": page_num
             })
         
-        logger.info(f"Created {len(sections)} logical sections")
+        logger.info("Created %d logical sections", len(sections))
         
         # Process each section with the text splitter
         for i, section in enumerate(sections):
             # Create chunks for this section
-            section_chunks = self.text_splitter.create_documents(
-                [section["content"]],
-                metadatas=[{
+            section_chunks = self._create_documents(
+                section["content"],
+                {
                     "section": section["title"],
                     "page_number": section["page"],
                     "section_index": i,
                     "type": "text",
                     "chunking_strategy": "semantic"
-                }]
+                }
             )
             
             # Add chunks to the result
             chunks.extend(section_chunks)
         
-        logger.info(f"Created {len(chunks)} total chunks")
+        logger.info("Created %d total chunks", len(chunks))
         return chunks
     
     def store_chunks(self, chunks: List[Document], collection_name: Optional[str] = None) -> None:
@@ -673,18 +824,18 @@ class SemanticChunker:
                     texts.append(chunk["content"])
                     metadatas.append(chunk.get("metadata", {}))
             
-            # Store documents in Qdrant using the correct method name
-            self.storage.store_documents(
-                collection_name=collection_name,
-                texts=texts,
-                embeddings=self.embeddings,
-                metadatas=metadatas
+            # Each batch is uploaded while the next one is embedded; repeated
+            # texts (boilerplate, overlapping row groups) hit the embedding cache
+            batches = (
+                (texts[start:start + INGEST_BATCH_SIZE], metadatas[start:start + INGEST_BATCH_SIZE])
+                for start in range(0, len(texts), INGEST_BATCH_SIZE)
             )
+            self.storage.store_batches(collection_name, batches, self.embeddings.embed_documents_cached)
             
-            logger.info(f"Stored {len(chunks)} chunks in collection '{collection_name}'")
+            logger.info("Stored %d chunks in collection '%s'", len(chunks), collection_name)
             
         except Exception as e:
-            logger.error(f"Error storing chunks in collection '{collection_name}': {e}")
+            logger.error("Error storing chunks in collection '%s': %s", collection_name, e)
             raise
     
     def process_and_store(self, elements: List[Dict], collection_name: Optional[str] = None) -> List[Document]:
@@ -705,9 +856,9 @@ class SemanticChunker:
             # Store chunks using the correct method
             self.store_chunks(chunks, collection_name)
             
-            logger.info(f"Successfully processed and stored {len(chunks)} chunks")
+            logger.info("Successfully processed and stored %d chunks", len(chunks))
             return chunks
             
         except Exception as e:
-            logger.error(f"Error in process_and_store: {e}")
+            logger.error("Error in process_and_store: %s", e)
             raise 
\ No newline at end of file
@@ -1,16 +1,28 @@
-from typing import List
-import json
+from typing import List, Optional
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import hashlib
 import logging
+import threading
 
 import boto3
-from langchain_aws import BedrockEmbeddings
+from cachetools import LRUCache
+import diskcache
+import orjson
+from botocore.config import Config
 from langchain_core.embeddings import Embeddings
 
 from src.utils.config import (
     AWS_ACCESS_KEY_ID,
     AWS_SECRET_ACCESS_KEY,
     AWS_REGION,
-    TITAN_EMBEDDING_MODEL_ID
+    TITAN_EMBEDDING_MODEL_ID,
+    EMBEDDING_BATCH_SIZE,
+    BEDROCK_MAX_ATTEMPTS,
+    BEDROCK_MAX_POOL_CONNECTIONS,
+    EMBEDDING_CACHE_DIR,
+    QUERY_EMBEDDING_CACHE_SIZE
 )
 
 # Configure logging
@@ -25,37 +37,150 @@ class TitanEmbeddings(Embeddings):
         """
         Initialize the Titan embeddings.
         """
-        self._bedrock_client = None
+        self._embedding_cache = None
+        
+        # Recent query embeddings, ahead of the on-disk cache
+        self._query_cache = LRUCache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+        self._query_cache_lock = threading.Lock()
+    
+    def __getstate__(self):
+        """
+        Pickle without the client, caches and lock; they are recreated
+        on first use after unpickling.
+        """
+        return {}
+    
+    def __setstate__(self, state):
+        """
+        Restore a pickled instance with fresh, lazily created state.
+        """
+        self.__init__()
     
     @property
     def bedrock_client(self):
         """
-        Lazy-load the Bedrock client to avoid pickling issues.
+        Get the shared Bedrock client; not stored on the instance to avoid
+        pickling issues.
         """
-        if self._bedrock_client is None:
-            self._bedrock_client = boto3.client(
-                service_name="bedrock-runtime",
-                region_name=AWS_REGION,
-                aws_access_key_id=AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=AWS_SECRET_ACCESS_KEY
-            )
-        return self._bedrock_client
+        return get_bedrock_client()
     
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+    @property
+    def embedding_cache(self) -> diskcache.Cache:
+        """
+        Lazy-open the on-disk embedding cache to avoid pickling issues.
+        """
+        if self._embedding_cache is None:
+            self._embedding_cache = diskcache.Cache(EMBEDDING_CACHE_DIR)
+        return self._embedding_cache
+    
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """
+        Build the embedding cache key for a text.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Cache key combining the model ID and the text's SHA-256
+        """
+        return f"{TITAN_EMBEDDING_MODEL_ID}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+    
+    @staticmethod
+    def _encode_embedding(embedding: List[float]) -> bytes:
+        """
+        Pack an embedding as float32 bytes for the cache.
+        
+        Args:
+            embedding: Embedding
+            
+        Returns:
+            Packed embedding
+        """
+        return array("f", embedding).tobytes()
+    
+    @staticmethod
+    def _decode_embedding(value: Optional[bytes]) -> Optional[List[float]]:
+        """
+        Unpack a cached embedding.
+        
+        Args:
+            value: Cached value, or None on a miss
+            
+        Returns:
+            Embedding, or None on a miss
+        """
+        if value is None or isinstance(value, list):
+            # Entries written before embeddings were packed are plain lists
+            return value
+        return array("f", value).tolist()
+    
+    def embed_documents_cached(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of documents, reusing embeddings of previously seen texts.
+        
+        Only texts missing from the on-disk cache are sent to Bedrock, so
+        re-ingesting overlapping chunks (e.g. the same document with a
+        different chunking strategy) skips most requests.
+        
+        Args:
+            texts: List of document texts
+            
+        Returns:
+            List of embeddings
+        """
+        keys = [self._cache_key(text) for text in texts]
+        embeddings = [self._decode_embedding(self.embedding_cache.get(key)) for key in keys]
+        
+        # Embed each distinct missing text once
+        missing = {}
+        for i, (key, embedding) in enumerate(zip(keys, embeddings)):
+            if embedding is None and key not in missing:
+                missing[key] = i
+        
+        if missing:
+            new_embeddings = self.embed_documents([texts[i] for i in missing.values()])
+            new_by_key = dict(zip(missing.keys(), new_embeddings))
+            for key, embedding in new_by_key.items():
+                self.embedding_cache.set(key, self._encode_embedding(embedding))
+            embeddings = [
+                embedding if embedding is not None else new_by_key[key]
+                for key, embedding in zip(keys, embeddings)
+            ]
+        
+        logger.info("Embedded %d texts (%d from cache)", len(texts), len(texts) - len(missing))
+        return embeddings
+    
+    def embed_documents(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[float]]:
         """
         Embed a list of documents.
         
+        Titan accepts one input per request, so up to ``batch_size`` requests
+        are kept in flight at once, longest texts first.
+        
         Args:
             texts: List of document texts
+            batch_size: Maximum number of concurrent requests
             
         Returns:
             List of embeddings
         """
-        embeddings = []
+        if not texts:
+            return []
+        
+        batch_size = batch_size or EMBEDDING_BATCH_SIZE
+        
+        # Create the client up front so worker threads share it
+        self.bedrock_client
         
-        for text in texts:
-            embedding = self.embed_query(text)
-            embeddings.append(embedding)
+        # Start the longest texts first so the slowest requests are not left
+        # running alone at the end of the batch
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        
+        embeddings = [None] * len(texts)
+        with ThreadPoolExecutor(max_workers=min(batch_size, len(texts))) as executor:
+            for i, embedding in zip(order, executor.map(self._embed_text, [texts[i] for i in order])):
+                embeddings[i] = embedding
         
         return embeddings
     
@@ -63,9 +188,39 @@ class TitanEmbeddings(Embeddings):
         """
         Embed a query.
         
+        Repeated queries are served from an in-memory LRU and then the
+        on-disk embedding cache before falling back to Bedrock.
+        
         Args:
             text: Query text
             
+        Returns:
+            Embedding
+        """
+        key = self._cache_key(text)
+        
+        with self._query_cache_lock:
+            embedding = self._query_cache.get(key)
+        
+        if embedding is None:
+            embedding = self._decode_embedding(self.embedding_cache.get(key))
+            if embedding is None:
+                embedding = self._embed_text(text)
+                self.embedding_cache.set(key, self._encode_embedding(embedding))
+            
+            with self._query_cache_lock:
+                self._query_cache[key] = embedding
+        
+        # Callers get their own copy of the cached embedding
+        return list(embedding)
+    
+    def _embed_text(self, text: str) -> List[float]:
+        """
+        Embed a text with a single Bedrock request.
+        
+        Args:
+            text: Text to embed
+            
         Returns:
             Embedding
         """
@@ -77,11 +232,11 @@ class TitanEmbeddings(Embeddings):
         # Call Bedrock
         response = self.bedrock_client.invoke_model(
             modelId=TITAN_EMBEDDING_MODEL_ID,
-            body=json.dumps(body)
+            body=orjson.dumps(body)
         )
         
         # Parse response
-        response_body = json.loads(response["body"].read())
+        response_body = orjson.loads(response["body"].read())
         embedding = response_body["embedding"]
         
         return embedding
@@ -93,4 +248,38 @@ class TitanEmbeddings(Embeddings):
         Returns:
             LangChain embeddings model
         """
-        return self.embeddings_model 
\ No newline at end of file
+        return self.embeddings_model 
+
+@lru_cache(maxsize=1)
+def get_bedrock_client():
+    """
+    Get the process-wide Bedrock runtime client.
+    
+    boto3 clients are thread-safe, so embeddings and the LLM share one
+    client, its credentials and its connection pool.
+    
+    Returns:
+        Shared Bedrock runtime client
+    """
+    return boto3.client(
+        service_name="bedrock-runtime",
+        region_name=AWS_REGION,
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        config=Config(
+            max_pool_connections=max(BEDROCK_MAX_POOL_CONNECTIONS, EMBEDDING_BATCH_SIZE),
+            # Concurrent requests can hit Bedrock's rate limits; adaptive
+            # mode backs off and throttles the client on ThrottlingException
+            retries={"mode": "adaptive", "max_attempts": BEDROCK_MAX_ATTEMPTS}
+        )
+    )
+
+@lru_cache(maxsize=1)
+def get_embeddings() -> TitanEmbeddings:
+    """
+    Get the process-wide Titan embeddings instance.
+    
+    Returns:
+        Shared TitanEmbeddings, so its Bedrock client and cache are reused
+    """
+    return TitanEmbeddings()
@@ -1,9 +1,10 @@
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any, Set, Tuple
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import logging
-import json
 import re
 
-import boto3
+import orjson
 from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_aws import ChatBedrock
@@ -12,13 +13,12 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain_core.documents import Document
 from qdrant_client.http.exceptions import UnexpectedResponse
 
-from src.embeddings.titan import TitanEmbeddings
-from src.storage.qdrant import QdrantStorage
+from src.embeddings.titan import get_bedrock_client, get_embeddings
+from src.storage.cache import SemanticQueryCache
+from src.storage.qdrant import get_async_storage, get_storage
 from src.utils.config import (
-    AWS_ACCESS_KEY_ID,
-    AWS_SECRET_ACCESS_KEY,
-    AWS_REGION,
     CLAUDE_MODEL_ID,
+    BEDROCK_LATENCY,
     RECURSIVE_COLLECTION_NAME,
     SEMANTIC_COLLECTION_NAME,
     DEFAULT_COLLECTION_NAME
@@ -27,6 +27,28 @@ from src.utils.config import (
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Keywords that suggest a query is about tabular data
+_TABLE_KEYWORDS = [
+    "table", "row", "column", "cell", "data",
+    "value", "statistic", "average", "mean", "sum",
+    "total", "maximum", "minimum", "count", "percentage",
+    "compare", "comparison", "trend", "growth", "decline",
+    "increase", "decrease", "ratio", "proportion", "distribution"
+]
+
+# Answer given when a collection returned no documents
+_NO_DOCUMENTS_ANSWER = (
+    "I don't have enough information to answer this question. "
+    "It appears that no documents have been processed yet, or the collections don't exist. "
+    "Please upload and process a document first using the /upload and /process endpoints."
+)
+
+# Table chunk purposes, most useful first: query > analysis > overview > display
+_TABLE_PURPOSE_RANK = {"query": 0, "analysis": 1, "overview": 2, "display": 3}
+
+# All keywords as whole words in a single pattern, compiled once
+_TABLE_QUERY_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, _TABLE_KEYWORDS)) + r")\b")
+
 class RAGQuery:
     """
     RAG query implementation with comparison between recursive and semantic chunking.
@@ -34,38 +56,27 @@ class RAGQuery:
     
     def __init__(self):
         """Initialize RAG query with components."""
-        self.embeddings = TitanEmbeddings()
-        self.storage = QdrantStorage()
-        self._bedrock_client = None
+        self.embeddings = get_embeddings()
+        self.storage = get_storage()
+        self.async_storage = get_async_storage()
+        self.query_cache = SemanticQueryCache(self.storage)
         self._llm = None
         
-        # Initialize Bedrock client and LLM
+        # Initialize LLM on the shared Bedrock client
         try:
-            self._bedrock_client = boto3.client(
-                service_name="bedrock-runtime",
-                region_name=AWS_REGION,
-                aws_access_key_id=AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=AWS_SECRET_ACCESS_KEY
-            )
-            
-            self._llm = ChatBedrock(
-                client=self._bedrock_client,
-                model_id=CLAUDE_MODEL_ID,
-                model_kwargs={
-                    "temperature": 0.2,
-                    "max_tokens": 1000,
-                    "top_p": 0.9,
-                }
-            )
+            self._llm = self._create_llm()
             logger.info("Successfully initialized Bedrock client and LLM")
         except Exception as e:
-            logger.error(f"Error initializing Bedrock client and LLM: {e}")
+            logger.error("Error initializing Bedrock client and LLM: %s", e)
             raise
     
     def query(self, query_text: str, recursive_collection: str, semantic_collection: str) -> Dict[str, Any]:
         """
         Query both collections and compare results.
         
+        Results for a semantically equivalent earlier query against the same
+        collections are served from the query cache.
+        
         Args:
             query_text: Query text
             recursive_collection: Name of the recursive chunking collection
@@ -82,26 +93,34 @@ class RAGQuery:
             if semantic_collection not in collections:
                 raise ValueError(f"Collection '{semantic_collection}' not found")
             
-            # Query recursive collection
-            recursive_results = self.storage.search_documents(
-                collection_name=recursive_collection,
-                query=query_text,
-                embeddings=self.embeddings,
-                limit=5
-            )
-            
-            # Query semantic collection
-            semantic_results = self.storage.search_documents(
-                collection_name=semantic_collection,
-                query=query_text,
-                embeddings=self.embeddings,
-                limit=5
+            # Embed once for the cache lookup and both searches
+            query_vector = self.embeddings.embed_query(query_text)
+            cached_result = self.query_cache.lookup(
+                query_vector, recursive_collection, semantic_collection, kind="retrieval"
             )
+            if cached_result is not None:
+                return cached_result
+            
+            # Query both collections concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                recursive_future, semantic_future = (
+                    executor.submit(
+                        self.storage.search_documents,
+                        collection_name=collection_name,
+                        query=query_text,
+                        embeddings=self.embeddings,
+                        limit=5,
+                        query_vector=query_vector
+                    )
+                    for collection_name in (recursive_collection, semantic_collection)
+                )
+                recursive_results = recursive_future.result()
+                semantic_results = semantic_future.result()
             
             # Compare results
             comparison = self._compare_results(recursive_results, semantic_results)
             
-            return {
+            result = {
                 "query": query_text,
                 "recursive": {
                     "collection": recursive_collection,
@@ -114,8 +133,13 @@ class RAGQuery:
                 "comparison": comparison
             }
             
+            self.query_cache.store(
+                query_text, query_vector, recursive_collection, semantic_collection, result, kind="retrieval"
+            )
+            return result
+            
         except Exception as e:
-            logger.error(f"Error querying collections: {e}")
+            logger.error("Error querying collections: %s", e)
             raise
     
     def _compare_results(self, recursive_docs: List[Document], semantic_docs: List[Document]) -> str:
@@ -138,29 +162,23 @@ class RAGQuery:
             comparison = []
             comparison.append(f"Found {rec_count} recursive chunks and {sem_count} semantic chunks.")
             
-            # Compare content types
-            rec_types = set(doc.metadata.get("type", "unknown") for doc in recursive_docs)
-            sem_types = set(doc.metadata.get("type", "unknown") for doc in semantic_docs)
+            # Summarize content types and metadata keys in one pass per list
+            rec_types, rec_metadata_keys = self._summarize_results(recursive_docs)
+            sem_types, sem_metadata_keys = self._summarize_results(semantic_docs)
             
+            # Compare content types
             if "table" in sem_types:
                 comparison.append("Semantic chunking found relevant table data.")
             if len(sem_types) > len(rec_types):
                 comparison.append("Semantic chunking provided more diverse content types.")
             
             # Compare metadata richness
-            rec_metadata_keys = set()
-            sem_metadata_keys = set()
-            for doc in recursive_docs:
-                rec_metadata_keys.update(doc.metadata.keys())
-            for doc in semantic_docs:
-                sem_metadata_keys.update(doc.metadata.keys())
-                
             if len(sem_metadata_keys) > len(rec_metadata_keys):
                 comparison.append("Semantic chunking preserved more metadata.")
                 
             # Compare content structure
-            rec_structured = any("section" in doc.metadata for doc in recursive_docs)
-            sem_structured = any("section" in doc.metadata for doc in semantic_docs)
+            rec_structured = "section" in rec_metadata_keys
+            sem_structured = "section" in sem_metadata_keys
             
             if sem_structured and not rec_structured:
                 comparison.append("Semantic chunking better preserved document structure.")
@@ -168,9 +186,28 @@ class RAGQuery:
             return "\n".join(comparison)
             
         except Exception as e:
-            logger.error(f"Error comparing results: {e}")
+            logger.error("Error comparing results: %s", e)
             return "Error comparing results"
     
+    @staticmethod
+    def _summarize_results(docs: List[Document]) -> Tuple[Set[str], Set[str]]:
+        """
+        Collect the content types and metadata keys of search results.
+        
+        Args:
+            docs: Search results
+            
+        Returns:
+            Tuple of content types and metadata keys
+        """
+        types = set()
+        metadata_keys = set()
+        for doc in docs:
+            metadata = doc.metadata
+            types.add(metadata.get("type", "unknown"))
+            metadata_keys.update(metadata)
+        return types, metadata_keys
+    
     def is_table_query(self, query: str) -> bool:
         """
         Determine if a query is likely about tabular data.
@@ -181,24 +218,16 @@ class RAGQuery:
         Returns:
             True if the query is likely about tables
         """
-        table_keywords = [
-            "table", "row", "column", "cell", "data", 
-            "value", "statistic", "average", "mean", "sum",
-            "total", "maximum", "minimum", "count", "percentage",
-            "compare", "comparison", "trend", "growth", "decline",
-            "increase", "decrease", "ratio", "proportion", "distribution"
-        ]
-        
-        query_lower = query.lower()
-        
         # Check for table-related keywords
-        for keyword in table_keywords:
-            if re.search(r'\b' + keyword + r'\b', query_lower):
-                return True
-        
-        return False
+        return _TABLE_QUERY_RE.search(query.lower()) is not None
     
-    def search_collection(self, collection_name: str, query: str, k: int = 5) -> List[Document]:
+    def search_collection(
+        self,
+        collection_name: str,
+        query: str,
+        k: int = 5,
+        query_vector: Optional[List[float]] = None
+    ) -> List[Document]:
         """
         Search a collection for relevant documents.
         
@@ -206,6 +235,7 @@ class RAGQuery:
             collection_name: Name of the collection
             query: Query text
             k: Number of results to return
+            query_vector: Optional precomputed query embedding
             
         Returns:
             List of relevant documents
@@ -219,66 +249,118 @@ class RAGQuery:
                 collection_name=collection_name,
                 query=query,
                 embeddings=self.embeddings,
-                limit=k + (3 if is_table_query else 0)  # Get extra results for table queries
+                limit=k + (3 if is_table_query else 0),  # Get extra results for table queries
+                query_vector=query_vector
             )
             
-            # Convert results to Documents
-            documents = []
-            for result in results:
-                documents.append(Document(
-                    page_content=result["text"],  # Changed from content to text
-                    metadata=result["metadata"]
-                ))
-            
-            # For table queries in semantic collection, prioritize structured table formats
-            if is_table_query and collection_name == SEMANTIC_COLLECTION_NAME:
-                # Group documents by table_id
-                table_docs = {}
-                text_docs = []
-                
-                for doc in documents:
-                    if doc.metadata.get("type") == "table":
-                        table_id = doc.metadata.get("table_id", "unknown")
-                        if table_id not in table_docs:
-                            table_docs[table_id] = []
-                        table_docs[table_id].append(doc)
-                    else:
-                        text_docs.append(doc)
-                
-                # Prioritize documents based on format for each table
-                prioritized_docs = []
-                
-                # First add one document of each relevant table
-                for table_id, docs in table_docs.items():
-                    # Sort by purpose: query > analysis > overview > display
-                    sorted_docs = sorted(docs, key=lambda d: {
-                        "query": 0, 
-                        "analysis": 1, 
-                        "overview": 2, 
-                        "display": 3
-                    }.get(d.metadata.get("table_purpose", ""), 4))
-                    
-                    # Add the most relevant document for this table
-                    if sorted_docs:
-                        prioritized_docs.append(sorted_docs[0])
-                        
-                        # If this table has JSON data, also include it
-                        json_docs = [d for d in sorted_docs if d.metadata.get("table_format") == "json"]
-                        if json_docs and json_docs[0] != sorted_docs[0]:
-                            prioritized_docs.append(json_docs[0])
-                
-                # Then add text documents
-                prioritized_docs.extend(text_docs)
-                
-                # Limit to k documents
-                documents = prioritized_docs[:k]
+            return self._rank_results(collection_name, results, is_table_query, k)
+            
+        except Exception as e:
+            logger.error("Error searching collection '%s': %s", collection_name, e)
+            return []
+    
+    async def asearch_collection(
+        self,
+        collection_name: str,
+        query: str,
+        k: int = 5,
+        query_vector: Optional[List[float]] = None
+    ) -> List[Document]:
+        """
+        Search a collection without blocking the event loop.
+        
+        Args:
+            collection_name: Name of the collection
+            query: Query text
+            k: Number of results to return
+            query_vector: Optional precomputed query embedding
             
-            return documents
+        Returns:
+            List of relevant documents
+        """
+        try:
+            # Check if this is a table-related query
+            is_table_query = self.is_table_query(query)
+            
+            # Search in Qdrant
+            results = await self.async_storage.search_documents(
+                collection_name=collection_name,
+                query=query,
+                embeddings=self.embeddings,
+                limit=k + (3 if is_table_query else 0),  # Get extra results for table queries
+                query_vector=query_vector
+            )
+            
+            return self._rank_results(collection_name, results, is_table_query, k)
             
         except Exception as e:
-            logger.error(f"Error searching collection '{collection_name}': {str(e)}")
+            logger.error("Error searching collection '%s': %s", collection_name, e)
             return []
     
+    def _rank_results(
+        self,
+        collection_name: str,
+        results: List[Dict],
+        is_table_query: bool,
+        k: int
+    ) -> List[Document]:
+        """
+        Convert search results to Documents and prioritize table formats.
+        
+        Args:
+            collection_name: Name of the searched collection
+            results: Raw search results from storage
+            is_table_query: Whether the query is about tabular data
+            k: Number of results to return
+            
+        Returns:
+            List of relevant documents
+        """
+        # Convert results to Documents
+        documents = [
+            Document(page_content=result["text"], metadata=result["metadata"])
+            for result in results
+        ]
+        
+        # For table queries in semantic collection, prioritize structured table formats
+        if is_table_query and collection_name == SEMANTIC_COLLECTION_NAME:
+            # One pass: keep each table's best-ranked document and its
+            # best-ranked JSON document (first one wins on ties)
+            best_docs = {}
+            json_docs = {}
+            text_docs = []
+            
+            for doc in documents:
+                metadata = doc.metadata
+                if metadata.get("type") != "table":
+                    text_docs.append(doc)
+                    continue
+                
+                table_id = metadata.get("table_id", "unknown")
+                rank = _TABLE_PURPOSE_RANK.get(metadata.get("table_purpose", ""), 4)
+                if table_id not in best_docs or rank < best_docs[table_id][0]:
+                    best_docs[table_id] = (rank, doc)
+                if metadata.get("table_format") == "json" and (
+                    table_id not in json_docs or rank < json_docs[table_id][0]
+                ):
+                    json_docs[table_id] = (rank, doc)
+            
+            # First add the most relevant document of each table, plus its
+            # JSON document when that is a different one
+            prioritized_docs = []
+            for table_id, (_, best_doc) in best_docs.items():
+                prioritized_docs.append(best_doc)
+                if table_id in json_docs and json_docs[table_id][1] != best_doc:
+                    prioritized_docs.append(json_docs[table_id][1])
+            
+            # Then add text documents
+            prioritized_docs.extend(text_docs)
+            
+            # Limit to k documents
+            documents = prioritized_docs[:k]
+        
+        return documents
+    
     def format_document_for_context(self, doc: Document) -> str:
         """
         Format a document for inclusion in the context.
@@ -299,29 +381,32 @@ class RAGQuery:
             if table_format == "json" and "json_data" in doc.metadata:
                 try:
                     # Parse the JSON data
-                    table_data = json.loads(doc.metadata["json_data"])
+                    table_data = orjson.loads(doc.metadata["json_data"])
                     
                     # Format as a more readable table for the LLM
-                    formatted_text = f"TABLE DATA (ID: {table_id}, FORMAT: JSON):\n"
+                    title = f"TABLE DATA (ID: {table_id}, FORMAT: JSON):"
+                    lines = [title]
                     
                     # If it's a list of records
                     if isinstance(table_data, list) and len(table_data) > 0:
                         # Get headers from the first record
                         headers = list(table_data[0].keys())
-                        formatted_text += " | ".join(headers) + "\n"
-                        formatted_text += "-" * len(formatted_text) + "\n"
+                        header_line = " | ".join(headers)
+                        lines.append(header_line)
+                        lines.append("-" * (len(title) + len(header_line) + 2))
                         
                         # Add rows
-                        for record in table_data:
-                            row = [str(record.get(h, "")) for h in headers]
-                            formatted_text += " | ".join(row) + "\n"
+                        lines.extend(
+                            " | ".join([str(record.get(h, "")) for h in headers])
+                            for record in table_data
+                        )
                     
                     # Add the JSON for completeness
-                    formatted_text += f"\nJSON Representation:\n{doc.metadata['json_data']}"
+                    lines.append(f"\nJSON Representation:\n{doc.metadata['json_data']}")
                     
-                    return formatted_text
+                    return "\n".join(lines)
                 except Exception as e:
-                    logger.warning(f"Error formatting JSON table data: {str(e)}")
+                    logger.warning("Error formatting JSON table data: %s", e)
             
             # Add table metadata to the content
             prefix = f"TABLE (ID: {table_id}, FORMAT: {table_format}, PURPOSE: {table_purpose}):\n"
@@ -333,25 +418,17 @@ class RAGQuery:
         
         return doc.page_content
     
-    def generate_answer(self, query: str, documents: List[Document]) -> str:
+    def _answer_prompt(self, query: str, documents: List[Document]) -> str:
         """
-        Generate an answer based on the query and documents.
+        Build the answer prompt for a query and its documents.
         
         Args:
             query: Query text
             documents: List of relevant documents
             
         Returns:
-            Generated answer
+            Prompt text
         """
-        # If no documents found, return a helpful message
-        if not documents:
-            return (
-                "I don't have enough information to answer this question. "
-                "It appears that no documents have been processed yet, or the collections don't exist. "
-                "Please upload and process a document first using the /upload and /process endpoints."
-            )
-            
         # Check if this is a table-related query
         is_table_query = self.is_table_query(query)
         
@@ -391,11 +468,46 @@ class RAGQuery:
         # Join document contents with clear separators
         context = "\n\n---\n\n".join(formatted_docs)
         
+        return prompt.format(context=context, question=query)
+    
+    @staticmethod
+    def _content_text(content: Any) -> str:
+        """
+        Get the text of a message or chunk's content.
+        
+        Args:
+            content: Message content; the Converse API streams lists of blocks
+            
+        Returns:
+            Text content
+        """
+        if isinstance(content, str):
+            return content
+        return "".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in content
+        )
+    
+    def generate_answer(self, query: str, documents: List[Document]) -> str:
+        """
+        Generate an answer based on the query and documents.
+        
+        Args:
+            query: Query text
+            documents: List of relevant documents
+            
+        Returns:
+            Generated answer
+        """
+        # If no documents found, return a helpful message
+        if not documents:
+            return _NO_DOCUMENTS_ANSWER
+        
+        prompt = self._answer_prompt(query, documents)
+        
         try:
             # Generate answer
-            response = self._llm.invoke(
-                prompt.format(context=context, question=query)
-            )
+            response = self._llm.invoke(prompt)
             
             # Extract the content from the response
             if hasattr(response, 'content'):
@@ -404,9 +516,52 @@ class RAGQuery:
                 return str(response)
                 
         except Exception as e:
-            logger.error(f"Error generating answer: {str(e)}")
+            logger.error("Error generating answer: %s", e)
             return f"Error generating answer: {str(e)}"
     
+    async def astream_answer(self, query: str, documents: List[Document]) -> AsyncIterator[str]:
+        """
+        Generate an answer, yielding text as the model produces it.
+        
+        The pieces concatenate to the full answer, so callers can show the
+        first tokens without waiting for the whole response.
+        
+        Args:
+            query: Query text
+            documents: List of relevant documents
+            
+        Returns:
+            Async iterator over pieces of the answer
+        """
+        # If no documents found, return a helpful message
+        if not documents:
+            yield _NO_DOCUMENTS_ANSWER
+            return
+        
+        prompt = await asyncio.to_thread(self._answer_prompt, query, documents)
+        
+        try:
+            async for chunk in self._llm.astream(prompt):
+                text = self._content_text(chunk.content)
+                if text:
+                    yield text
+        except Exception as e:
+            logger.error("Error generating answer: %s", e)
+            yield f"Error generating answer: {str(e)}"
+    
+    async def agenerate_answer(self, query: str, documents: List[Document]) -> str:
+        """
+        Generate an answer without blocking the event loop.
+        
+        Args:
+            query: Query text
+            documents: List of relevant documents
+            
+        Returns:
+            Generated answer
+        """
+        return await asyncio.to_thread(self.generate_answer, query, documents)
+    
     def compare_answers(self, query: str, answer1: str, answer2: str) -> str:
         """
         Compare two answers and explain which one is better.
@@ -486,7 +641,7 @@ class RAGQuery:
                 return str(response)
                 
         except Exception as e:
-            logger.error(f"Error generating comparison: {str(e)}")
+            logger.error("Error generating comparison: %s", e)
             return f"Error generating comparison: {str(e)}"
     
     def _ensure_collections_exist(self):
@@ -497,7 +652,7 @@ class RAGQuery:
             # Get list of existing collections
             collections = self.storage.list_collections()
             collection_names = [c.name for c in collections]
-            logger.info(f"Found existing collections: {collection_names}")
+            logger.info("Found existing collections: %s", collection_names)
             
             # Check recursive collection
             if RECURSIVE_COLLECTION_NAME not in collection_names:
@@ -506,12 +661,12 @@ class RAGQuery:
                 found = False
                 for alt_name in alternative_names:
                     if alt_name in collection_names and alt_name != RECURSIVE_COLLECTION_NAME:
-                        logger.warning(f"Found alternative collection '{alt_name}' instead of '{RECURSIVE_COLLECTION_NAME}'")
+                        logger.warning("Found alternative collection '%s' instead of '%s'", alt_name, RECURSIVE_COLLECTION_NAME)
                         found = True
                         break
                 
                 if not found:
-                    logger.warning(f"Collection '{RECURSIVE_COLLECTION_NAME}' does not exist. It will be created when documents are processed.")
+                    logger.warning("Collection '%s' does not exist. It will be created when documents are processed.", RECURSIVE_COLLECTION_NAME)
             
             # Check semantic collection
             if SEMANTIC_COLLECTION_NAME not in collection_names:
@@ -520,29 +675,23 @@ class RAGQuery:
                 found = False
                 for alt_name in alternative_names:
                     if alt_name in collection_names and alt_name != SEMANTIC_COLLECTION_NAME:
-                        logger.warning(f"Found alternative collection '{alt_name}' instead of '{SEMANTIC_COLLECTION_NAME}'")
+                        logger.warning("Found alternative collection '%s' instead of '%s'", alt_name, SEMANTIC_COLLECTION_NAME)
                         found = True
                         break
                 
                 if not found:
-                    logger.warning(f"Collection '{SEMANTIC_COLLECTION_NAME}' does not exist. It will be created when documents are processed.")
+                    logger.warning("Collection '%s' does not exist. It will be created when documents are processed.", SEMANTIC_COLLECTION_NAME)
                 
         except Exception as e:
-            logger.error(f"Error checking collections: {str(e)}")
+            logger.error("Error checking collections: %s", e)
     
     @property
     def bedrock_client(self):
         """
-        Lazy-load the Bedrock client to avoid pickling issues.
+        Get the shared Bedrock client; not stored on the instance to avoid
+        pickling issues.
         """
-        if self._bedrock_client is None:
-            self._bedrock_client = boto3.client(
-                service_name="bedrock-runtime",
-                region_name=AWS_REGION,
-                aws_access_key_id=AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=AWS_SECRET_ACCESS_KEY
-            )
-        return self._bedrock_client
+        return get_bedrock_client()
     
     @property
     def llm(self):
@@ -550,13 +699,31 @@ class RAGQuery:
         Lazy-load the LLM to avoid pickling issues.
         """
         if self._llm is None:
-            self._llm = ChatBedrock(
-                client=self.bedrock_client,
-                model_id=CLAUDE_MODEL_ID,
-                model_kwargs={
-                    "temperature": 0.2,
-                    "max_tokens": 1000,
-                    "top_p": 0.9,
-                }
-            )
-        return self._llm 
\ No newline at end of file
+            self._llm = self._create_llm()
+        return self._llm
+    
+    def _create_llm(self) -> ChatBedrock:
+        """
+        Create the Claude chat model.
+        
+        Latency-optimized inference is only available through the Converse
+        API, so that API is used when BEDROCK_LATENCY is "optimized".
+        
+        Returns:
+            ChatBedrock instance
+        """
+        model_kwargs = {
+            "temperature": 0.2,
+            "max_tokens": 1000,
+            "top_p": 0.9,
+        }
+        latency_optimized = BEDROCK_LATENCY == "optimized"
+        if latency_optimized:
+            model_kwargs["performance_config"] = {"latency": "optimized"}
+        
+        return ChatBedrock(
+            client=self.bedrock_client,
+            model_id=CLAUDE_MODEL_ID,
+            model_kwargs=model_kwargs,
+            beta_use_converse_api=latency_optimized
+        ) 
\ No newline at end of file
@@ -0,0 +1,268 @@
+"""
+Semantic query cache backed by a Qdrant collection.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from qdrant_client.http import models
+
+from src.storage.qdrant import QdrantStorage
+from src.utils.config import (
+    CACHE_THRESHOLD,
+    EMBEDDING_DIMENSION,
+    QUERY_CACHE_COLLECTION,
+    QUERY_CACHE_LOCAL_SIZE,
+    QUERY_CACHE_LOCAL_TTL
+)
+
+logger = logging.getLogger(__name__)
+
+class SemanticQueryCache:
+    """
+    Cache of query responses keyed by query embedding.
+
+    A lookup hits when a query previously answered against the same pair of
+    collections has a cosine similarity of at least the configured threshold.
+    Entries are tagged with a kind so different response shapes (e.g. API
+    responses and raw retrieval results) never answer for each other.
+
+    Recent entries are also kept in process as a normalized float32 matrix,
+    so repeated queries are answered with one matrix product instead of a
+    round-trip to Qdrant. Local entries expire after a short TTL because
+    invalidations in other workers do not reach them.
+    """
+
+    def __init__(
+        self,
+        storage: QdrantStorage,
+        collection_name: str = QUERY_CACHE_COLLECTION,
+        threshold: float = CACHE_THRESHOLD
+    ):
+        """
+        Initialize the query cache.
+
+        Args:
+            storage: Qdrant storage used to hold cached responses
+            collection_name: Name of the cache collection
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        self.storage = storage
+        self.threshold = threshold
+
+        # Add prefix to collection name if not already present
+        if not collection_name.startswith(storage.prefix):
+            collection_name = f"{storage.prefix}{collection_name}"
+        self.collection_name = collection_name
+        self._collection_ready = False
+
+        # Ring buffer of recent entries; a slot is free when its entry is None
+        self._local_lock = threading.Lock()
+        self._local_vectors = np.zeros((QUERY_CACHE_LOCAL_SIZE, EMBEDDING_DIMENSION), dtype=np.float32)
+        self._local_entries: List[Optional[Tuple[Tuple[str, str, str], Dict[str, Any], float]]] = [None] * QUERY_CACHE_LOCAL_SIZE
+        self._local_next = 0
+
+    def _ensure_collection(self) -> None:
+        """Create the cache collection on first use."""
+        if self._collection_ready:
+            return
+
+        if self.collection_name not in self.storage.list_collections():
+            self.storage.create_collection(self.collection_name, vector_size=EMBEDDING_DIMENSION)
+        self._collection_ready = True
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        """Return a vector as unit-length float32, so dot products are cosines."""
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def _local_lookup(self, query: np.ndarray, scope: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        """Return the best unexpired local entry for a scope above the threshold."""
+        if not QUERY_CACHE_LOCAL_SIZE:
+            return None
+
+        now = time.monotonic()
+        with self._local_lock:
+            scores = self._local_vectors @ query
+            best_score, best_response = self.threshold, None
+            for slot, entry in enumerate(self._local_entries):
+                if entry is None or entry[0] != scope:
+                    continue
+                if entry[2] < now:
+                    self._local_entries[slot] = None
+                elif scores[slot] >= best_score:
+                    best_score, best_response = scores[slot], entry[1]
+
+        if best_response is not None:
+            logger.info("Local query cache hit (score %.3f)", best_score)
+        return best_response
+
+    def _local_store(self, query: np.ndarray, scope: Tuple[str, str, str], response: Dict[str, Any]) -> None:
+        """Add an entry to the local tier, overwriting the oldest slot."""
+        if not QUERY_CACHE_LOCAL_SIZE:
+            return
+
+        with self._local_lock:
+            slot = self._local_next
+            self._local_vectors[slot] = query
+            self._local_entries[slot] = (scope, response, time.monotonic() + QUERY_CACHE_LOCAL_TTL)
+            self._local_next = (slot + 1) % QUERY_CACHE_LOCAL_SIZE
+
+    @staticmethod
+    def _collections_filter(recursive_collection: str, semantic_collection: str, kind: str) -> models.Filter:
+        """Build a filter matching entries of a kind for a pair of collections."""
+        return models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="kind",
+                    match=models.MatchValue(value=kind)
+                ),
+                models.FieldCondition(
+                    key="recursive_collection",
+                    match=models.MatchValue(value=recursive_collection)
+                ),
+                models.FieldCondition(
+                    key="semantic_collection",
+                    match=models.MatchValue(value=semantic_collection)
+                )
+            ]
+        )
+
+    def lookup(
+        self,
+        query_vector: List[float],
+        recursive_collection: str,
+        semantic_collection: str,
+        kind: str = "response"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response for a query embedding.
+
+        Args:
+            query_vector: Query embedding
+            recursive_collection: Name of the recursive chunking collection
+            semantic_collection: Name of the semantic chunking collection
+            kind: Kind of cached response
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        try:
+            query = self._normalize(query_vector)
+            scope = (kind, recursive_collection, semantic_collection)
+            response = self._local_lookup(query, scope)
+            if response is not None:
+                return response
+
+            self._ensure_collection()
+
+            hits = self.storage.client.query_points(
+                collection_name=self.collection_name,
+                query=query_vector,
+                query_filter=self._collections_filter(recursive_collection, semantic_collection, kind),
+                limit=1,
+                score_threshold=self.threshold
+            ).points
+
+            if hits and hits[0].score >= self.threshold:
+                logger.info("Query cache hit (score %.3f)", hits[0].score)
+                response = hits[0].payload["response"]
+                self._local_store(query, scope, response)
+                return response
+        except Exception as e:
+            logger.warning("Query cache lookup failed: %s", e)
+
+        return None
+
+    def store(
+        self,
+        query_text: str,
+        query_vector: List[float],
+        recursive_collection: str,
+        semantic_collection: str,
+        response: Dict[str, Any],
+        kind: str = "response"
+    ) -> None:
+        """
+        Store a response in the cache.
+
+        Args:
+            query_text: Query text
+            query_vector: Query embedding
+            recursive_collection: Name of the recursive chunking collection
+            semantic_collection: Name of the semantic chunking collection
+            response: Response to cache
+            kind: Kind of cached response
+        """
+        # Deterministic ID so repeating the same query overwrites its entry
+        point_id = str(uuid.uuid5(
+            uuid.NAMESPACE_URL,
+            f"{kind}|{recursive_collection}|{semantic_collection}|{query_text}"
+        ))
+
+        try:
+            self._local_store(
+                self._normalize(query_vector), (kind, recursive_collection, semantic_collection), response
+            )
+
+            self._ensure_collection()
+
+            self.storage.client.upsert(
+                collection_name=self.collection_name,
+                points=[
+                    models.PointStruct(
+                        id=point_id,
+                        vector=query_vector,
+                        payload={
+                            "kind": kind,
+                            "query": query_text,
+                            "recursive_collection": recursive_collection,
+                            "semantic_collection": semantic_collection,
+                            "response": response
+                        }
+                    )
+                ]
+            )
+        except Exception as e:
+            logger.warning("Query cache store failed: %s", e)
+
+    def invalidate(self, collection_name: str) -> None:
+        """
+        Drop cached responses that were built from a collection.
+
+        Args:
+            collection_name: Name of the collection whose contents changed
+        """
+        with self._local_lock:
+            for slot, entry in enumerate(self._local_entries):
+                if entry is not None and collection_name in entry[0][1:]:
+                    self._local_entries[slot] = None
+
+        try:
+            self._ensure_collection()
+
+            self.storage.client.delete(
+                collection_name=self.collection_name,
+                points_selector=models.FilterSelector(
+                    filter=models.Filter(
+                        should=[
+                            models.FieldCondition(
+                                key="recursive_collection",
+                                match=models.MatchValue(value=collection_name)
+                            ),
+                            models.FieldCondition(
+                                key="semantic_collection",
+                                match=models.MatchValue(value=collection_name)
+                            )
+                        ]
+                    )
+                )
+            )
+        except Exception as e:
+            logger.warning("Query cache invalidation failed for '%s': %s", collection_name, e)
@@ -2,19 +2,104 @@
 Qdrant vector storage implementation.
 """
 
+import asyncio
+import json
 import logging
-from typing import List, Dict, Any, Optional
-from qdrant_client import QdrantClient
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http import models
 from src.utils.config import (
     QDRANT_HOST,
     QDRANT_PORT,
     QDRANT_COLLECTION_PREFIX,
+    QDRANT_VECTOR_DATATYPE,
+    QDRANT_QUANTIZATION,
+    QDRANT_OVERSAMPLING,
     load_config
 )
 
 logger = logging.getLogger(__name__)
 
+# Collections known to exist, shared by the sync and async storages so a
+# deletion through either one is seen by both; uploads skip the existence check
+_known_collections: Set[str] = set()
+
+def point_id(text: str, metadata: Optional[Dict] = None) -> str:
+    """
+    Derive a stable point ID from a document's content.
+    
+    Args:
+        text: Document text
+        metadata: Optional metadata dictionary
+        
+    Returns:
+        UUID string that is identical across ingests of the same document
+    """
+    content = text + "\0" + json.dumps(metadata or {}, sort_keys=True, default=str)
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, content))
+
+def _quantization_config() -> Optional[models.QuantizationConfig]:
+    """
+    Build the quantization config selected by QDRANT_QUANTIZATION.
+    
+    Returns:
+        INT8 scalar or binary quantization kept in RAM, or None if disabled
+    """
+    quantization = QDRANT_QUANTIZATION.lower()
+    if quantization == "int8":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True
+            )
+        )
+    if quantization == "binary":
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=True)
+        )
+    if quantization == "none":
+        return None
+    raise ValueError(f"Unsupported QDRANT_QUANTIZATION: {QDRANT_QUANTIZATION}")
+
+def _search_params() -> Optional[models.SearchParams]:
+    """
+    Build the search params matching the collection quantization.
+    
+    Returns:
+        Params that oversample on the quantized vectors and rescore the
+        candidates with the originals, or None if quantization is disabled
+    """
+    if QDRANT_QUANTIZATION.lower() == "none":
+        return None
+    return models.SearchParams(
+        quantization=models.QuantizationSearchParams(
+            rescore=True,
+            oversampling=QDRANT_OVERSAMPLING
+        )
+    )
+
+def _vectors_config(vector_size: int) -> models.VectorParams:
+    """
+    Build the vector config for a new collection.
+    
+    Args:
+        vector_size: Size of the vectors
+        
+    Returns:
+        Cosine vector params stored with QDRANT_VECTOR_DATATYPE precision;
+        the originals live on disk when quantized copies are kept in RAM
+    """
+    return models.VectorParams(
+        size=vector_size,
+        distance=models.Distance.COSINE,
+        datatype=models.Datatype(QDRANT_VECTOR_DATATYPE.lower()),
+        on_disk=QDRANT_QUANTIZATION.lower() != "none"
+    )
+
 class QdrantStorage:
     """
     Qdrant vector storage implementation.
@@ -25,12 +110,31 @@ class QdrantStorage:
         self.host = load_config("QDRANT_HOST", "localhost")
         self.port = int(load_config("QDRANT_PORT", "6333"))
         self.prefix = load_config("QDRANT_COLLECTION_PREFIX", "semantic_chunking_")
+        self.grpc_port = int(load_config("QDRANT_GRPC_PORT", "6334"))
+        self.prefer_grpc = load_config("QDRANT_PREFER_GRPC", "true").lower() == "true"
         
         self.client = QdrantClient(
             host=self.host,
-            port=self.port
+            port=self.port,
+            grpc_port=self.grpc_port,
+            prefer_grpc=self.prefer_grpc,
+            timeout=30
         )
-        logger.info(f"Connected to Qdrant at {self.host}:{self.port}")
+        logger.info("Connected to Qdrant at %s:%s", self.host, self.port)
+    
+    def _full_name(self, collection_name: str) -> str:
+        """
+        Add the collection prefix to a name if it is not already present.
+        
+        Args:
+            collection_name: Collection name, with or without the prefix
+            
+        Returns:
+            Prefixed collection name
+        """
+        if collection_name.startswith(self.prefix):
+            return collection_name
+        return self.prefix + collection_name
     
     def create_collection(self, collection_name: str, vector_size: int = 1536) -> None:
         """
@@ -41,24 +145,42 @@ class QdrantStorage:
             vector_size: Size of the vectors (default: 1536 for Titan embeddings)
         """
         try:
-            # Add prefix to collection name if not already present
-            if not collection_name.startswith(self.prefix):
-                collection_name = f"{self.prefix}{collection_name}"
+            collection_name = self._full_name(collection_name)
             
-            # Create collection
+            # Create collection with configured precision and quantization
             self.client.create_collection(
                 collection_name=collection_name,
-                vectors_config=models.VectorParams(
-                    size=vector_size,
-                    distance=models.Distance.COSINE
-                )
+                vectors_config=_vectors_config(vector_size),
+                quantization_config=_quantization_config(),
+                hnsw_config=models.HnswConfigDiff(on_disk=False)
             )
-            logger.info(f"Created collection '{collection_name}'")
+            _known_collections.add(collection_name)
+            logger.info("Created collection '%s'", collection_name)
             
         except Exception as e:
-            logger.error(f"Error creating collection '{collection_name}': {e}")
+            logger.error("Error creating collection '%s': %s", collection_name, e)
             raise
     
+    def ensure_collection(self, collection_name: str) -> None:
+        """
+        Create a collection unless it is already known to exist.
+        
+        Args:
+            collection_name: Name of the collection
+        """
+        collection_name = self._full_name(collection_name)
+        if collection_name in _known_collections:
+            return
+        
+        if not self.client.collection_exists(collection_name):
+            try:
+                self.create_collection(collection_name)
+            except Exception:
+                # Another writer may have created it in the meantime
+                if not self.client.collection_exists(collection_name):
+                    raise
+        _known_collections.add(collection_name)
+    
     def delete_collection(self, collection_name: str) -> None:
         """
         Delete a collection.
@@ -67,16 +189,15 @@ class QdrantStorage:
             collection_name: Name of the collection
         """
         try:
-            # Add prefix to collection name if not already present
-            if not collection_name.startswith(self.prefix):
-                collection_name = f"{self.prefix}{collection_name}"
+            collection_name = self._full_name(collection_name)
             
-            # Delete collection
+            # Forget the collection first, so a failed delete is rechecked
+            _known_collections.discard(collection_name)
             self.client.delete_collection(collection_name=collection_name)
-            logger.info(f"Deleted collection '{collection_name}'")
+            logger.info("Deleted collection '%s'", collection_name)
             
         except Exception as e:
-            logger.error(f"Error deleting collection '{collection_name}': {e}")
+            logger.error("Error deleting collection '%s': %s", collection_name, e)
             raise
     
     def list_collections(self) -> List[str]:
@@ -91,7 +212,7 @@ class QdrantStorage:
             return [c.name for c in collections.collections]
             
         except Exception as e:
-            logger.error(f"Error listing collections: {e}")
+            logger.error("Error listing collections: %s", e)
             raise
     
     def get_collection_info(self, collection_name: str) -> Dict[str, Any]:
@@ -105,9 +226,7 @@ class QdrantStorage:
             Dictionary with collection information
         """
         try:
-            # Add prefix to collection name if not already present
-            if not collection_name.startswith(self.prefix):
-                collection_name = f"{self.prefix}{collection_name}"
+            collection_name = self._full_name(collection_name)
             
             # Get collection info
             collection = self.client.get_collection(collection_name=collection_name)
@@ -120,7 +239,7 @@ class QdrantStorage:
             }
             
         except Exception as e:
-            logger.error(f"Error getting info for collection '{collection_name}': {e}")
+            logger.error("Error getting info for collection '%s': %s", collection_name, e)
             raise
     
     def store_documents(
@@ -128,66 +247,166 @@ class QdrantStorage:
         collection_name: str,
         texts: List[str],
         embeddings: Any,
-        metadatas: Optional[List[Dict]] = None
+        metadatas: Optional[List[Dict]] = None,
+        vectors: Optional[List[List[float]]] = None,
+        batch_size: int = 512,
+        parallel: int = 8,
+        wait: bool = True
     ) -> None:
         """
-        Store documents in a collection.
+        Store documents in a collection, uploading batches concurrently.
         
         Args:
             collection_name: Name of the collection
             texts: List of text documents
             embeddings: Embeddings model to use
             metadatas: Optional list of metadata dictionaries
+            vectors: Optional precomputed embeddings for the texts
+            batch_size: Number of points per upsert request
+            parallel: Maximum number of upsert requests in flight
+            wait: Whether to return only once the points are searchable
         """
         try:
-            # Add prefix to collection name if not already present
-            if not collection_name.startswith(self.prefix):
-                collection_name = f"{self.prefix}{collection_name}"
+            collection_name = self._full_name(collection_name)
             
             # Create collection if it doesn't exist
-            try:
-                self.create_collection(collection_name)
-            except Exception:
-                # Collection might already exist
-                pass
+            self.ensure_collection(collection_name)
             
-            # Generate embeddings
-            vectors = embeddings.embed_documents(texts)
+            # Generate embeddings unless the caller already has them
+            if vectors is None:
+                vectors = embeddings.embed_documents(texts)
             
             # Prepare points
             points = []
             for i, (text, vector) in enumerate(zip(texts, vectors)):
+                metadata = metadatas[i] if metadatas else {}
                 point = models.PointStruct(
-                    id=i,
+                    id=point_id(text, metadata),
                     vector=vector,
                     payload={
                         "text": text,
-                        **(metadatas[i] if metadatas else {})
+                        **metadata
                     }
                 )
                 points.append(point)
             
-            # Upload points in batches
-            batch_size = 100
-            for i in range(0, len(points), batch_size):
-                batch = points[i:i + batch_size]
+            def upload_batch(batch: List[models.PointStruct], wait_batch: bool) -> None:
                 self.client.upsert(
                     collection_name=collection_name,
-                    points=batch
+                    points=batch,
+                    wait=wait_batch
                 )
             
-            logger.info(f"Stored {len(texts)} documents in collection '{collection_name}'")
+            # Updates are applied in order, so the earlier batches go out
+            # concurrently without waiting and only the last one waits for
+            # all of them to be searchable
+            batches = [points[i:i + batch_size] for i in range(0, len(points), batch_size)]
+            if len(batches) > 1:
+                with ThreadPoolExecutor(max_workers=min(parallel, len(batches) - 1)) as executor:
+                    list(executor.map(lambda batch: upload_batch(batch, False), batches[:-1]))
+            if batches:
+                upload_batch(batches[-1], wait)
+            
+            logger.info("Stored %d documents in collection '%s'", len(texts), collection_name)
             
         except Exception as e:
-            logger.error(f"Error storing documents in collection '{collection_name}': {e}")
+            # Recheck the collection on the next upload, in case it was deleted elsewhere
+            _known_collections.discard(collection_name)
+            logger.error("Error storing documents in collection '%s': %s", collection_name, e)
             raise
     
+    def store_batches(
+        self,
+        collection_name: str,
+        batches: Iterable[Tuple[List[str], List[Dict]]],
+        embed: Callable[[List[str]], List[List[float]]]
+    ) -> int:
+        """
+        Embed and store batches of documents, overlapping the two stages.
+        
+        Each batch is uploaded in the background while the next one is being
+        embedded, and only the final upload waits for the whole ingest to be
+        searchable. Documents already stored under their content-derived ID
+        are neither embedded nor uploaded again.
+        
+        Args:
+            collection_name: Name of the collection
+            batches: Batches of texts and their metadata dictionaries
+            embed: Function embedding a list of texts
+            
+        Returns:
+            Number of documents stored
+        """
+        collection_name = self._full_name(collection_name)
+        
+        # Create collection if it doesn't exist
+        self.ensure_collection(collection_name)
+        
+        stored = 0
+        skipped = 0
+        with ThreadPoolExecutor(max_workers=1) as uploader:
+            upload = None
+            # Hold each batch back until the next arrives so that only the
+            # final upload waits
+            held = None
+            for texts, metadatas in batches:
+                # Drop documents that an earlier ingest already stored
+                ids = [point_id(text, metadata) for text, metadata in zip(texts, metadatas)]
+                existing = {
+                    str(record.id) for record in self.client.retrieve(
+                        collection_name=collection_name,
+                        ids=ids,
+                        with_payload=False,
+                        with_vectors=False
+                    )
+                }
+                if existing:
+                    skipped += len(existing)
+                    new = [i for i, id_ in enumerate(ids) if id_ not in existing]
+                    texts = [texts[i] for i in new]
+                    metadatas = [metadatas[i] for i in new]
+                if not texts:
+                    continue
+                
+                vectors = embed(texts)
+                if held is not None:
+                    if upload is not None:
+                        upload.result()
+                    upload = uploader.submit(
+                        self.store_documents,
+                        collection_name=collection_name,
+                        texts=held[0],
+                        embeddings=None,
+                        metadatas=held[1],
+                        vectors=held[2],
+                        wait=False
+                    )
+                    stored += len(held[0])
+                held = (texts, metadatas, vectors)
+            
+            if upload is not None:
+                upload.result()
+            if held is not None:
+                self.store_documents(
+                    collection_name=collection_name,
+                    texts=held[0],
+                    embeddings=None,
+                    metadatas=held[1],
+                    vectors=held[2]
+                )
+                stored += len(held[0])
+        
+        if skipped:
+            logger.info("Skipped %d documents already in collection '%s'", skipped, collection_name)
+        return stored
+    
     def search_documents(
         self,
         collection_name: str,
         query: str,
         embeddings: Any,
-        limit: int = 5
+        limit: int = 5,
+        query_vector: Optional[List[float]] = None
     ) -> List[Dict]:
         """
         Search for similar documents in a collection.
@@ -197,24 +416,428 @@ class QdrantStorage:
             query: Query text
             embeddings: Embeddings model to use
             limit: Maximum number of results to return
+            query_vector: Optional precomputed query embedding
             
         Returns:
             List of documents with similarity scores
         """
         try:
-            # Add prefix to collection name if not already present
-            if not collection_name.startswith(self.prefix):
-                collection_name = f"{self.prefix}{collection_name}"
+            collection_name = self._full_name(collection_name)
             
-            # Generate query embedding
-            query_vector = embeddings.embed_query(query)
+            # Generate query embedding unless the caller already has one
+            if query_vector is None:
+                query_vector = embeddings.embed_query(query)
             
             # Search collection
-            results = self.client.search(
+            results = self.client.query_points(
+                collection_name=collection_name,
+                query=query_vector,
+                limit=limit,
+                search_params=_search_params()
+            ).points
+            
+            # Format results
+            documents = []
+            for result in results:
+                documents.append({
+                    "text": result.payload["text"],
+                    "metadata": {k: v for k, v in result.payload.items() if k != "text"},
+                    "score": result.score
+                })
+            
+            return documents
+            
+        except Exception as e:
+            logger.error("Error searching collection '%s': %s", collection_name, e)
+            raise
+
+class AsyncQdrantStorage:
+    """
+    Qdrant vector storage implementation for use from async request handlers.
+    """
+    
+    def __init__(self):
+        """Initialize async Qdrant client."""
+        self.host = load_config("QDRANT_HOST", "localhost")
+        self.port = int(load_config("QDRANT_PORT", "6333"))
+        self.prefix = load_config("QDRANT_COLLECTION_PREFIX", "semantic_chunking_")
+        self.grpc_port = int(load_config("QDRANT_GRPC_PORT", "6334"))
+        self.prefer_grpc = load_config("QDRANT_PREFER_GRPC", "true").lower() == "true"
+        
+        self.client = AsyncQdrantClient(
+            host=self.host,
+            port=self.port,
+            grpc_port=self.grpc_port,
+            prefer_grpc=self.prefer_grpc,
+            timeout=30
+        )
+        logger.info("Connected to Qdrant at %s:%s (async)", self.host, self.port)
+    
+    def _full_name(self, collection_name: str) -> str:
+        """
+        Add the collection prefix to a name if it is not already present.
+        
+        Args:
+            collection_name: Collection name, with or without the prefix
+            
+        Returns:
+            Prefixed collection name
+        """
+        if collection_name.startswith(self.prefix):
+            return collection_name
+        return self.prefix + collection_name
+    
+    async def create_collection(self, collection_name: str, vector_size: int = 1536) -> None:
+        """
+        Create a new collection.
+        
+        Args:
+            collection_name: Name of the collection
+            vector_size: Size of the vectors (default: 1536 for Titan embeddings)
+        """
+        try:
+            collection_name = self._full_name(collection_name)
+            
+            # Create collection with configured precision and quantization
+            await self.client.create_collection(
                 collection_name=collection_name,
-                query_vector=query_vector,
-                limit=limit
+                vectors_config=_vectors_config(vector_size),
+                quantization_config=_quantization_config(),
+                hnsw_config=models.HnswConfigDiff(on_disk=False)
             )
+            _known_collections.add(collection_name)
+            logger.info("Created collection '%s'", collection_name)
+            
+        except Exception as e:
+            logger.error("Error creating collection '%s': %s", collection_name, e)
+            raise
+    
+    async def ensure_collection(self, collection_name: str) -> None:
+        """
+        Create a collection unless it is already known to exist.
+        
+        Args:
+            collection_name: Name of the collection
+        """
+        collection_name = self._full_name(collection_name)
+        if collection_name in _known_collections:
+            return
+        
+        if not await self.client.collection_exists(collection_name):
+            try:
+                await self.create_collection(collection_name)
+            except Exception:
+                # Another writer may have created it in the meantime
+                if not await self.client.collection_exists(collection_name):
+                    raise
+        _known_collections.add(collection_name)
+    
+    async def delete_collection(self, collection_name: str) -> None:
+        """
+        Delete a collection.
+        
+        Args:
+            collection_name: Name of the collection
+        """
+        try:
+            collection_name = self._full_name(collection_name)
+            
+            # Forget the collection first, so a failed delete is rechecked
+            _known_collections.discard(collection_name)
+            await self.client.delete_collection(collection_name=collection_name)
+            logger.info("Deleted collection '%s'", collection_name)
+            
+        except Exception as e:
+            logger.error("Error deleting collection '%s': %s", collection_name, e)
+            raise
+    
+    async def list_collections(self) -> List[str]:
+        """
+        List all collections.
+        
+        Returns:
+            List of collection names
+        """
+        try:
+            collections = await self.client.get_collections()
+            return [c.name for c in collections.collections]
+            
+        except Exception as e:
+            logger.error("Error listing collections: %s", e)
+            raise
+    
+    async def get_collection_info(self, collection_name: str) -> Dict[str, Any]:
+        """
+        Get information about a collection.
+        
+        Args:
+            collection_name: Name of the collection
+            
+        Returns:
+            Dictionary with collection information
+        """
+        try:
+            collection_name = self._full_name(collection_name)
+            
+            # Get collection info
+            collection = await self.client.get_collection(collection_name=collection_name)
+            
+            return {
+                "name": collection_name,
+                "vector_size": collection.config.params.vectors.size,
+                "vector_count": collection.vectors_count,
+                "status": collection.status
+            }
+            
+        except Exception as e:
+            logger.error("Error getting info for collection '%s': %s", collection_name, e)
+            raise
+    
+    async def copy_collection(self, source_name: str, target_name: str, batch_size: int = 100) -> None:
+        """
+        Copy all points from one collection into another.
+        
+        Args:
+            source_name: Name of the collection to copy from
+            target_name: Name of the collection to copy into
+            batch_size: Number of points to move per request
+        """
+        try:
+            source_name = self._full_name(source_name)
+            target_name = self._full_name(target_name)
+            
+            # Page through the source collection and upsert into the target
+            offset = None
+            copied = 0
+            while True:
+                records, offset = await self.client.scroll(
+                    collection_name=source_name,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True
+                )
+                
+                if records:
+                    await self.client.upsert(
+                        collection_name=target_name,
+                        points=[
+                            models.PointStruct(id=record.id, vector=record.vector, payload=record.payload)
+                            for record in records
+                        ]
+                    )
+                    copied += len(records)
+                
+                if offset is None:
+                    break
+            
+            logger.info("Copied %d points from '%s' to '%s'", copied, source_name, target_name)
+            
+        except Exception as e:
+            logger.error("Error copying collection '%s' to '%s': %s", source_name, target_name, e)
+            raise
+    
+    async def store_documents(
+        self,
+        collection_name: str,
+        texts: List[str],
+        embeddings: Any,
+        metadatas: Optional[List[Dict]] = None,
+        vectors: Optional[List[List[float]]] = None,
+        batch_size: int = 512,
+        parallel: int = 4,
+        wait: bool = True
+    ) -> None:
+        """
+        Store documents in a collection, uploading batches concurrently.
+        
+        Args:
+            collection_name: Name of the collection
+            texts: List of text documents
+            embeddings: Embeddings model to use
+            metadatas: Optional list of metadata dictionaries
+            vectors: Optional precomputed embeddings for the texts
+            batch_size: Number of points per upsert request
+            parallel: Maximum number of upsert requests in flight
+            wait: Whether to return only once the points are searchable
+        """
+        try:
+            collection_name = self._full_name(collection_name)
+            
+            # Create collection if it doesn't exist
+            await self.ensure_collection(collection_name)
+            
+            # Generate embeddings unless the caller already has them
+            if vectors is None:
+                vectors = await asyncio.to_thread(embeddings.embed_documents, texts)
+            
+            # Prepare points
+            points = []
+            for i, (text, vector) in enumerate(zip(texts, vectors)):
+                metadata = metadatas[i] if metadatas else {}
+                point = models.PointStruct(
+                    id=point_id(text, metadata),
+                    vector=vector,
+                    payload={
+                        "text": text,
+                        **metadata
+                    }
+                )
+                points.append(point)
+            
+            # Upload batches with a bounded number of requests in flight
+            semaphore = asyncio.Semaphore(parallel)
+            
+            async def upload_batch(batch: List[models.PointStruct], wait_batch: bool) -> None:
+                async with semaphore:
+                    await self.client.upsert(
+                        collection_name=collection_name,
+                        points=batch,
+                        wait=wait_batch
+                    )
+            
+            # Updates are applied in order, so the earlier batches go out
+            # without waiting and only the last one waits for all of them
+            batches = [points[i:i + batch_size] for i in range(0, len(points), batch_size)]
+            await asyncio.gather(*(upload_batch(batch, False) for batch in batches[:-1]))
+            if batches:
+                await upload_batch(batches[-1], wait)
+            
+            logger.info("Stored %d documents in collection '%s'", len(texts), collection_name)
+            
+        except Exception as e:
+            # Recheck the collection on the next upload, in case it was deleted elsewhere
+            _known_collections.discard(collection_name)
+            logger.error("Error storing documents in collection '%s': %s", collection_name, e)
+            raise
+    
+    async def store_batches(
+        self,
+        collection_name: str,
+        batches: Iterable[Tuple[List[str], List[Dict]]],
+        embed: Callable[[List[str]], List[List[float]]],
+        queue_size: int = 2
+    ) -> int:
+        """
+        Embed and store batches of documents, overlapping the two stages.
+        
+        Each batch is uploaded while the next one is being embedded, so peak
+        memory is bounded by the queue depth rather than the whole input.
+        Documents already stored under their content-derived ID are neither
+        embedded nor uploaded again.
+        
+        Args:
+            collection_name: Name of the collection
+            batches: Batches of texts and their metadata dictionaries
+            embed: Blocking function embedding a list of texts
+            queue_size: Number of embedded batches buffered for upload
+            
+        Returns:
+            Number of documents stored
+        """
+        collection_name = self._full_name(collection_name)
+        
+        # Create collection if it doesn't exist
+        await self.ensure_collection(collection_name)
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        stored = 0
+        skipped = 0
+        
+        async def embed_stage() -> None:
+            nonlocal skipped
+            for texts, metadatas in batches:
+                # Drop documents that an earlier ingest already stored
+                ids = [point_id(text, metadata) for text, metadata in zip(texts, metadatas)]
+                existing = {
+                    str(record.id) for record in await self.client.retrieve(
+                        collection_name=collection_name,
+                        ids=ids,
+                        with_payload=False,
+                        with_vectors=False
+                    )
+                }
+                if existing:
+                    skipped += len(existing)
+                    new = [i for i, id_ in enumerate(ids) if id_ not in existing]
+                    texts = [texts[i] for i in new]
+                    metadatas = [metadatas[i] for i in new]
+                if not texts:
+                    continue
+                
+                vectors = await asyncio.to_thread(embed, texts)
+                await queue.put((texts, metadatas, vectors))
+            await queue.put(None)
+        
+        async def upload_stage() -> None:
+            nonlocal stored
+            # Hold each batch back until the next arrives so that only the
+            # final upload waits for the whole ingest to be searchable
+            held = None
+            while True:
+                batch = await queue.get()
+                if held is not None:
+                    texts, metadatas, vectors = held
+                    await self.store_documents(
+                        collection_name=collection_name,
+                        texts=texts,
+                        embeddings=None,
+                        metadatas=metadatas,
+                        vectors=vectors,
+                        wait=batch is None
+                    )
+                    stored += len(texts)
+                if batch is None:
+                    break
+                held = batch
+        
+        # Stop the other stage as soon as either one fails
+        tasks = [asyncio.create_task(embed_stage()), asyncio.create_task(upload_stage())]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
+        
+        if skipped:
+            logger.info("Skipped %d documents already in collection '%s'", skipped, collection_name)
+        return stored
+    
+    async def search_documents(
+        self,
+        collection_name: str,
+        query: str,
+        embeddings: Any,
+        limit: int = 5,
+        query_vector: Optional[List[float]] = None
+    ) -> List[Dict]:
+        """
+        Search for similar documents in a collection.
+        
+        Args:
+            collection_name: Name of the collection
+            query: Query text
+            embeddings: Embeddings model to use
+            limit: Maximum number of results to return
+            query_vector: Optional precomputed query embedding
+            
+        Returns:
+            List of documents with similarity scores
+        """
+        try:
+            collection_name = self._full_name(collection_name)
+            
+            # Generate query embedding unless the caller already has one
+            if query_vector is None:
+                query_vector = await asyncio.to_thread(embeddings.embed_query, query)
+            
+            # Search collection
+            results = (await self.client.query_points(
+                collection_name=collection_name,
+                query=query_vector,
+                limit=limit,
+                search_params=_search_params()
+            )).points
             
             # Format results
             documents = []
@@ -228,5 +851,25 @@ class QdrantStorage:
             return documents
             
         except Exception as e:
-            logger.error(f"Error searching collection '{collection_name}': {e}")
-            raise 
\ No newline at end of file
+            logger.error("Error searching collection '%s': %s", collection_name, e)
+            raise
+
+@lru_cache(maxsize=1)
+def get_storage() -> QdrantStorage:
+    """
+    Get the process-wide Qdrant storage instance.
+    
+    Returns:
+        Shared QdrantStorage
+    """
+    return QdrantStorage()
+
+@lru_cache(maxsize=1)
+def get_async_storage() -> AsyncQdrantStorage:
+    """
+    Get the process-wide async Qdrant storage instance.
+    
+    Returns:
+        Shared AsyncQdrantStorage
+    """
+    return AsyncQdrantStorage()
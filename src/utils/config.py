@@ -20,11 +20,17 @@ AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 TITAN_MODEL_ID = os.getenv("TITAN_MODEL_ID", "amazon.titan-embed-text-v1")
 TITAN_EMBEDDING_MODEL_ID = TITAN_MODEL_ID
 CLAUDE_MODEL_ID = os.getenv("CLAUDE_MODEL_ID", "anthropic.claude-3-sonnet-20240229-v1:0")
+BEDROCK_LATENCY = os.getenv("BEDROCK_LATENCY", "standard")  # standard | optimized
 
 # Qdrant Configuration
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "true").lower() == "true"
 QDRANT_COLLECTION_PREFIX = os.getenv("QDRANT_COLLECTION_PREFIX", "")
+QDRANT_VECTOR_DATATYPE = os.getenv("QDRANT_VECTOR_DATATYPE", "float16")
+QDRANT_QUANTIZATION = os.getenv("QDRANT_QUANTIZATION", "int8")
+QDRANT_OVERSAMPLING = float(os.getenv("QDRANT_OVERSAMPLING", "2.0"))
 
 # Collection names with prefix
 DEFAULT_COLLECTION_NAME = f"{QDRANT_COLLECTION_PREFIX}financial_report"
@@ -36,14 +42,44 @@ RECURSIVE_CHUNK_SIZE = int(os.getenv("RECURSIVE_CHUNK_SIZE", "1000"))
 RECURSIVE_CHUNK_OVERLAP = int(os.getenv("RECURSIVE_CHUNK_OVERLAP", "200"))
 SEMANTIC_CHUNK_SIZE = int(os.getenv("SEMANTIC_CHUNK_SIZE", "1000"))
 SEMANTIC_CHUNK_OVERLAP = int(os.getenv("SEMANTIC_CHUNK_OVERLAP", "200"))
+CHUNK_WORKERS = int(os.getenv("CHUNK_WORKERS", "1"))
+# Semantic chunking only uses worker processes for at least this many
+# characters of input; below it, process startup and pickling cost more
+# than chunking itself
+CHUNK_PARALLEL_MIN_CHARS = int(os.getenv("CHUNK_PARALLEL_MIN_CHARS", "5000000"))
+
+# PDF parsing: hi_res runs layout detection and table inference on every
+# page; fast reads the text layer only
+PDF_STRATEGY = os.getenv("PDF_STRATEGY", "hi_res")
+# PDFs longer than PDF_PAGES_PER_WORKER pages are split into page ranges
+# partitioned by up to PDF_WORKERS processes (each loads its own layout model)
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "1"))
+PDF_PAGES_PER_WORKER = int(os.getenv("PDF_PAGES_PER_WORKER", "20"))
 
 # API Configuration
 UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "uploads")
 MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", "16777216"))  # 16MB
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", "1048576"))  # 1MB
+COLLECTIONS_CACHE_TTL = float(os.getenv("COLLECTIONS_CACHE_TTL", "5"))  # seconds
 
 # Vector dimensions
 EMBEDDING_DIMENSION = 1536
 
+# Embedding Configuration
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "25"))
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "64"))
+BEDROCK_MAX_ATTEMPTS = int(os.getenv("BEDROCK_MAX_ATTEMPTS", "10"))
+BEDROCK_MAX_POOL_CONNECTIONS = int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", "64"))
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "2048"))
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", os.path.join(UPLOAD_FOLDER, ".embed_cache"))
+CHUNK_CACHE_DIR = os.getenv("CHUNK_CACHE_DIR", os.path.join(UPLOAD_FOLDER, ".chunk_cache"))
+
+# Query cache Configuration
+QUERY_CACHE_COLLECTION = os.getenv("QUERY_CACHE_COLLECTION", "_query_cache")
+CACHE_THRESHOLD = float(os.getenv("CACHE_THRESHOLD", "0.92"))
+QUERY_CACHE_LOCAL_SIZE = int(os.getenv("QUERY_CACHE_LOCAL_SIZE", "256"))
+QUERY_CACHE_LOCAL_TTL = float(os.getenv("QUERY_CACHE_LOCAL_TTL", "60"))  # seconds
+
 def load_config(key: str, default: T, type_converter: Optional[Callable[[str], T]] = None) -> T:
     """
     Load configuration value from environment variable with type conversion.
@@ -4,7 +4,7 @@ Handles complex tables, nested tables, headers, and body text.
 """
 
 import logging
-import json
+import orjson
 import pandas as pd
 from bs4 import BeautifulSoup
 from typing import Dict, List, Any, Tuple, Optional, Union
@@ -12,6 +12,34 @@ from langchain.schema import Document
 
 logger = logging.getLogger(__name__)
 
+# Prefer the C-based lxml backend for BeautifulSoup
+try:
+    import lxml  # noqa: F401
+    BS4_PARSER = "lxml"
+except ImportError:
+    logger.warning("lxml not available, falling back to html.parser")
+    BS4_PARSER = "html.parser"
+
+def table_rows(table_element):
+    """
+    Yield the rows that belong to a table, skipping rows of nested tables.
+    
+    Args:
+        table_element: BeautifulSoup table element
+        
+    Returns:
+        Iterator over the table's own ``tr`` elements
+    """
+    for child in table_element.find_all(['thead', 'tbody', 'tfoot', 'tr'], recursive=False):
+        if child.name == 'tr':
+            yield child
+        else:
+            yield from child.find_all('tr', recursive=False)
+
+def _row_cells(row) -> List[Any]:
+    """Return the ``td``/``th`` cells of a row without searching nested tables."""
+    return [child for child in row.children if child.name in ('td', 'th')]
+
 class HTMLParser:
     """Parser for HTML documents with enhanced table handling."""
     
@@ -19,17 +47,18 @@ class HTMLParser:
         """Initialize the HTML parser."""
         self.soup = None
         
-    def parse_html(self, html_content: str) -> Dict[str, Any]:
+    def parse_html(self, html_content: Union[str, bytes]) -> Dict[str, Any]:
         """
         Parse HTML content and extract structured elements.
         
         Args:
-            html_content: HTML content as string
+            html_content: HTML content as string, or raw bytes to let the
+                parser detect the document's encoding
             
         Returns:
             Dictionary containing extracted elements
         """
-        self.soup = BeautifulSoup(html_content, 'html.parser')
+        self.soup = BeautifulSoup(html_content, BS4_PARSER)
         
         # Extract document structure
         result = {
@@ -56,15 +85,17 @@ class HTMLParser:
         return "Untitled Document"
     
     def _extract_headers(self) -> List[Dict[str, str]]:
-        """Extract all headers with their hierarchy level."""
-        headers = []
-        for level in range(1, 7):  # h1 to h6
-            for header in self.soup.find_all(f'h{level}'):
-                headers.append({
-                    "level": level,
-                    "text": header.get_text(strip=True)
-                })
-        return headers
+        """Extract all headers with their hierarchy level, grouped by level."""
+        # One pass over the document; the stable sort keeps document order
+        # within each level
+        headers = sorted(self.soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']), key=lambda header: header.name)
+        return [
+            {
+                "level": int(header.name[1]),
+                "text": header.get_text(strip=True)
+            }
+            for header in headers
+        ]
     
     def _extract_paragraphs(self) -> List[str]:
         """Extract all paragraphs."""
@@ -76,26 +107,17 @@ class HTMLParser:
         return paragraphs
     
     def _extract_lists(self) -> List[Dict[str, Any]]:
-        """Extract ordered and unordered lists."""
-        lists = []
-        
-        # Process unordered lists
-        for ul in self.soup.find_all('ul'):
-            items = [li.get_text(strip=True) for li in ul.find_all('li')]
-            lists.append({
-                "type": "unordered",
-                "items": items
-            })
-        
-        # Process ordered lists
-        for ol in self.soup.find_all('ol'):
-            items = [li.get_text(strip=True) for li in ol.find_all('li')]
-            lists.append({
-                "type": "ordered",
-                "items": items
-            })
-            
-        return lists
+        """Extract unordered lists, then ordered lists."""
+        # One pass over the document; the stable sort keeps document order
+        # within each list type
+        list_tags = sorted(self.soup.find_all(['ul', 'ol']), key=lambda list_tag: list_tag.name == 'ol')
+        return [
+            {
+                "type": "ordered" if list_tag.name == 'ol' else "unordered",
+                "items": [li.get_text(strip=True) for li in list_tag.find_all('li')]
+            }
+            for list_tag in list_tags
+        ]
     
     def _extract_tables(self) -> List[Dict[str, Any]]:
         """Extract all tables with enhanced structure handling."""
@@ -119,73 +141,61 @@ class HTMLParser:
         Returns:
             Dictionary containing table structure and data
         """
-        # Extract caption if available
-        caption = table.find('caption')
+        # Only walk the table's own structure; nested tables are processed
+        # once, from the cell that contains them
+        caption = table.find('caption', recursive=False)
         caption_text = caption.get_text(strip=True) if caption else f"Table {table_idx + 1}"
         
+        def cell_data(cell) -> Dict[str, Any]:
+            # Handle colspan and rowspan
+            return {
+                "text": cell.get_text(strip=True),
+                "colspan": int(cell.get('colspan', 1)),
+                "rowspan": int(cell.get('rowspan', 1))
+            }
+        
         # Extract headers
         headers = []
-        thead = table.find('thead')
+        thead = table.find('thead', recursive=False)
         if thead:
-            header_rows = thead.find_all('tr')
-            for row in header_rows:
-                header_cells = []
-                for cell in row.find_all(['th', 'td']):
-                    # Handle colspan and rowspan
-                    colspan = int(cell.get('colspan', 1))
-                    rowspan = int(cell.get('rowspan', 1))
-                    header_cells.append({
-                        "text": cell.get_text(strip=True),
-                        "colspan": colspan,
-                        "rowspan": rowspan
-                    })
-                headers.append(header_cells)
+            header_rows = thead.find_all('tr', recursive=False)
+            body_rows = [row for row in table_rows(table) if row.parent is not thead]
         else:
-            # Try to use the first row as header if thead is not explicitly defined
-            first_row = table.find('tr')
-            if first_row:
-                header_cells = []
-                for cell in first_row.find_all(['th', 'td']):
-                    colspan = int(cell.get('colspan', 1))
-                    rowspan = int(cell.get('rowspan', 1))
-                    header_cells.append({
-                        "text": cell.get_text(strip=True),
-                        "colspan": colspan,
-                        "rowspan": rowspan
-                    })
-                headers.append(header_cells)
+            # Use the first row as header if thead is not explicitly defined,
+            # and skip it in the body
+            body_rows = list(table_rows(table))
+            header_rows = body_rows[:1]
+            body_rows = body_rows[1:]
         
-        # Extract rows (excluding header rows if they were in thead)
-        rows = []
-        tbody = table.find('tbody') or table
+        for row in header_rows:
+            headers.append([cell_data(cell) for cell in _row_cells(row)])
         
-        # If we used the first row as header and there's no thead, skip it in the body
-        start_idx = 1 if not table.find('thead') and headers and tbody == table else 0
+        # Find the tables nested directly in this table's cells in one pass
+        # rather than searching every cell
+        nested_by_cell: Dict[int, List[Any]] = {}
+        for nested_table in table.find_all('table'):
+            if nested_table.find_parent('table') is table:
+                cell = nested_table.find_parent(['td', 'th'])
+                nested_by_cell.setdefault(id(cell), []).append(nested_table)
         
-        for row in tbody.find_all('tr')[start_idx:]:
+        # Extract rows
+        rows = []
+        for row in body_rows:
             row_cells = []
-            for cell in row.find_all(['td', 'th']):
-                # Handle colspan and rowspan
-                colspan = int(cell.get('colspan', 1))
-                rowspan = int(cell.get('rowspan', 1))
+            for cell in _row_cells(row):
+                data = cell_data(cell)
                 
-                # Check for nested tables
+                # Process tables nested in the cell
                 nested_tables = []
-                for nested_idx, nested_table in enumerate(cell.find_all('table')):
+                for nested_idx, nested_table in enumerate(nested_by_cell.get(id(cell), ())):
                     nested_table_data = self._process_table(nested_table, nested_idx)
                     if nested_table_data:
                         nested_tables.append(nested_table_data)
                 
-                cell_data = {
-                    "text": cell.get_text(strip=True),
-                    "colspan": colspan,
-                    "rowspan": rowspan
-                }
-                
                 if nested_tables:
-                    cell_data["nested_tables"] = nested_tables
+                    data["nested_tables"] = nested_tables
                     
-                row_cells.append(cell_data)
+                row_cells.append(data)
             
             if row_cells:  # Only add non-empty rows
                 rows.append(row_cells)
@@ -221,20 +231,16 @@ class HTMLParser:
                     except (ValueError, TypeError):
                         pass
             except Exception as e:
-                logger.warning(f"Failed to create DataFrame for table: {e}")
+                logger.warning("Failed to create DataFrame for table: %s", e)
         
         # Generate statistics for numeric columns
         stats = {}
         if df is not None:
-            for col in df.columns:
-                if pd.api.types.is_numeric_dtype(df[col]):
-                    stats[col] = {
-                        "min": df[col].min(),
-                        "max": df[col].max(),
-                        "mean": df[col].mean(),
-                        "median": df[col].median(),
-                        "sum": df[col].sum()
-                    }
+            # One aggregation over all numeric columns; the result is float,
+            # so the statistics stay JSON-serializable
+            numeric = df.select_dtypes('number')
+            if not numeric.empty:
+                stats = numeric.agg(['min', 'max', 'mean', 'median', 'sum']).to_dict()
         
         # Create a readable text representation
         text_representation = self._table_to_text(caption_text, simple_headers, simple_rows)
@@ -250,23 +256,23 @@ class HTMLParser:
     
     def _table_to_text(self, caption: str, headers: List[str], rows: List[List[str]]) -> str:
         """Convert table to a readable text representation."""
-        text = f"{caption}\n\n"
+        lines = [caption, ""]
         
         if headers:
-            text += " | ".join(headers) + "\n"
-            text += "-" * (sum(len(h) for h in headers) + 3 * (len(headers) - 1)) + "\n"
+            lines.append(" | ".join(headers))
+            lines.append("-" * (sum(len(h) for h in headers) + 3 * (len(headers) - 1)))
         
-        for row in rows:
-            text += " | ".join(row) + "\n"
+        lines.extend(" | ".join(row) for row in rows)
+        lines.append("")
             
-        return text
+        return "\n".join(lines)
     
-    def create_documents(self, html_content: str, metadata: Dict[str, Any] = None) -> List[Document]:
+    def create_documents(self, html_content: Union[str, bytes], metadata: Dict[str, Any] = None) -> List[Document]:
         """
         Create LangChain Document objects from HTML content.
         
         Args:
-            html_content: HTML content as string
+            html_content: HTML content as string or raw bytes
             metadata: Additional metadata to include
             
         Returns:
@@ -354,7 +360,9 @@ class HTMLParser:
                     "source": f"table_{i}_structured",
                     "document_type": "table_structured",
                     "caption": table["caption"],
-                    "structured_data": json.dumps(structured_data)
+                    "structured_data": orjson.dumps(
+                        structured_data, option=orjson.OPT_SERIALIZE_NUMPY
+                    ).decode()
                 }
             )
             documents.append(table_structured_doc)
@@ -398,13 +406,15 @@ def parse_html_file(file_path: str, metadata: Dict[str, Any] = None) -> List[Doc
         metadata = {**metadata, "source": file_path}
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        # Hand the raw bytes to the parser: no decoded copy of the whole
+        # document is made, and the encoding comes from the document itself
+        with open(file_path, 'rb') as f:
             html_content = f.read()
         
         parser = HTMLParser()
         return parser.create_documents(html_content, metadata)
     except Exception as e:
-        logger.error(f"Error parsing HTML file {file_path}: {e}")
+        logger.error("Error parsing HTML file %s: %s", file_path, e)
         return []
 
 
@@ -426,5 +436,5 @@ def parse_html_content(html_content: str, metadata: Dict[str, Any] = None) -> Li
         parser = HTMLParser()
         return parser.create_documents(html_content, metadata)
     except Exception as e:
-        logger.error(f"Error parsing HTML content: {e}")
+        logger.error("Error parsing HTML content: %s", e)
         return [] 
\ No newline at end of file
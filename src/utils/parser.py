@@ -1,7 +1,11 @@
 import logging
 from typing import List, Dict, Any
+import multiprocessing
 import os
+import tempfile
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 from unstructured.partition.pdf import partition_pdf
 from unstructured.documents.elements import (
@@ -12,10 +16,19 @@ from unstructured.documents.elements import (
     ListItem
 )
 
+from src.utils.config import PDF_STRATEGY, PDF_WORKERS, PDF_PAGES_PER_WORKER
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Try to import PyPDF for fallback
+# Prefer the PDFium-based extractor for the fallback, then PyPDF
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    logger.warning("pypdfium2 not available, fallback PDF parsing will use PyPDF")
+    PDFIUM_AVAILABLE = False
+
 try:
     import pypdf
     PYPDF_AVAILABLE = True
@@ -23,6 +36,44 @@ except ImportError:
     logger.warning("PyPDF not available for fallback PDF parsing")
     PYPDF_AVAILABLE = False
 
+def extract_text_with_pdfium(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Extract text from PDF using PDFium as a fallback method.
+    
+    Args:
+        file_path: Path to the PDF file
+        
+    Returns:
+        List of structured elements
+    """
+    logger.info("Using PDFium fallback for PDF parsing: %s", file_path)
+    
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        # Extract text from each page
+        elements = []
+        for page_num, page in enumerate(pdf):
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_bounded()
+            finally:
+                textpage.close()
+                page.close()
+            
+            if text.strip():  # Only add non-empty pages
+                elements.append({
+                    "type": "NarrativeText",
+                    "text": text,
+                    "metadata": {
+                        "page_number": page_num + 1
+                    }
+                })
+        
+        logger.info("Extracted %d pages with PDFium fallback", len(elements))
+        return elements
+    finally:
+        pdf.close()
+
 def extract_text_with_pypdf(file_path: str) -> List[Dict[str, Any]]:
     """
     Extract text from PDF using PyPDF as a fallback method.
@@ -33,7 +84,7 @@ def extract_text_with_pypdf(file_path: str) -> List[Dict[str, Any]]:
     Returns:
         List of structured elements
     """
-    logger.info(f"Using PyPDF fallback for PDF parsing: {file_path}")
+    logger.info("Using PyPDF fallback for PDF parsing: %s", file_path)
     
     try:
         # Open the PDF file
@@ -54,10 +105,10 @@ def extract_text_with_pypdf(file_path: str) -> List[Dict[str, Any]]:
                         }
                     })
             
-            logger.info(f"Extracted {len(elements)} pages with PyPDF fallback")
+            logger.info("Extracted %d pages with PyPDF fallback", len(elements))
             return elements
     except Exception as e:
-        logger.error(f"Error in PyPDF fallback: {str(e)}")
+        logger.error("Error in PyPDF fallback: %s", e)
         # Return a single element with error message
         return [{
             "type": "NarrativeText",
@@ -65,6 +116,116 @@ def extract_text_with_pypdf(file_path: str) -> List[Dict[str, Any]]:
             "metadata": {"page_number": 1}
         }]
 
+def _partition(file_path: str, strategy: str) -> List[Element]:
+    """
+    Partition a PDF with unstructured.
+    
+    Args:
+        file_path: Path to the PDF file
+        strategy: Partitioning strategy ("hi_res" or "fast")
+        
+    Returns:
+        List of unstructured elements
+    """
+    return partition_pdf(
+        filename=file_path,
+        extract_images_in_pdf=False,
+        infer_table_structure=strategy == "hi_res",
+        strategy=strategy
+    )
+
+def _element_to_dict(element: Element) -> Dict[str, Any]:
+    """
+    Convert an unstructured element to a dictionary.
+    
+    Args:
+        element: Unstructured element
+        
+    Returns:
+        Dictionary with the element type, text and metadata
+    """
+    metadata = getattr(element, "metadata", None)
+    return {
+        "type": element.__class__.__name__,
+        "text": getattr(element, "text", None) or str(element),
+        "metadata": metadata.to_dict() if metadata is not None else {}
+    }
+
+def _partition_pages(part_path: str, strategy: str, first_page: int, file_path: str) -> List[Dict[str, Any]]:
+    """
+    Partition a page range split out of a PDF.
+    
+    Runs in a worker process; page numbers and file names are mapped back
+    to the original document.
+    
+    Args:
+        part_path: Path to the PDF holding the page range
+        strategy: Partitioning strategy
+        first_page: Page number of the range's first page in the original
+        file_path: Path to the original PDF file
+        
+    Returns:
+        List of structured elements
+    """
+    result = [_element_to_dict(element) for element in _partition(part_path, strategy)]
+    for element in result:
+        metadata = element["metadata"]
+        if "page_number" in metadata:
+            metadata["page_number"] += first_page - 1
+        if "filename" in metadata:
+            metadata["filename"] = os.path.basename(file_path)
+        if "file_directory" in metadata:
+            metadata["file_directory"] = os.path.dirname(file_path)
+    return result
+
+@lru_cache(maxsize=1)
+def _pdf_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool used to partition long PDFs.
+    
+    Workers are spawned rather than forked since the API calls into the
+    parser from threads, and are kept so each loads its layout model once.
+    
+    Returns:
+        ProcessPoolExecutor instance
+    """
+    return ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+def _partition_to_dicts(file_path: str, strategy: str) -> List[Dict[str, Any]]:
+    """
+    Partition a PDF into structured elements.
+    
+    Short PDFs are partitioned inline; longer ones are split into ranges of
+    PDF_PAGES_PER_WORKER pages partitioned in parallel when PDF_WORKERS > 1.
+    
+    Args:
+        file_path: Path to the PDF file
+        strategy: Partitioning strategy
+        
+    Returns:
+        List of structured elements in page order
+    """
+    if PDF_WORKERS <= 1 or not PYPDF_AVAILABLE:
+        return [_element_to_dict(element) for element in _partition(file_path, strategy)]
+    
+    reader = pypdf.PdfReader(file_path)
+    page_count = len(reader.pages)
+    if page_count <= PDF_PAGES_PER_WORKER:
+        return [_element_to_dict(element) for element in _partition(file_path, strategy)]
+    
+    logger.info("Partitioning %d pages of %s in ranges of %d", page_count, file_path, PDF_PAGES_PER_WORKER)
+    with tempfile.TemporaryDirectory() as part_dir:
+        futures = []
+        for start in range(0, page_count, PDF_PAGES_PER_WORKER):
+            writer = pypdf.PdfWriter()
+            for page in reader.pages[start:start + PDF_PAGES_PER_WORKER]:
+                writer.add_page(page)
+            part_path = os.path.join(part_dir, f"pages_{start + 1}.pdf")
+            writer.write(part_path)
+            futures.append(_pdf_pool().submit(_partition_pages, part_path, strategy, start + 1, file_path))
+        
+        return [element for future in futures for element in future.result()]
+
 def parse_pdf(file_path: str) -> List[Dict[str, Any]]:
     """
     Parse a PDF file into structured elements.
@@ -75,52 +236,38 @@ def parse_pdf(file_path: str) -> List[Dict[str, Any]]:
     Returns:
         List of structured elements
     """
-    logger.info(f"Parsing PDF: {file_path}")
+    logger.info("Parsing PDF: %s", file_path)
     
     # Check if file exists
     if not os.path.exists(file_path):
-        logger.error(f"File not found: {file_path}")
+        logger.error("File not found: %s", file_path)
         raise FileNotFoundError(f"File not found: {file_path}")
     
     # Parse PDF
     try:
         # Try using unstructured first
-        elements = partition_pdf(
-            filename=file_path,
-            extract_images_in_pdf=False,
-            infer_table_structure=True,
-            strategy="hi_res"
-        )
+        result = _partition_to_dicts(file_path, PDF_STRATEGY)
         
-        # Convert elements to dictionaries
-        result = []
-        for element in elements:
-            # Get element type
-            element_type = element.__class__.__name__
-            
-            # Get element text
-            text = str(element)
-            
-            # Get element metadata
-            metadata = {}
-            if hasattr(element, "metadata"):
-                metadata = element.metadata.to_dict()
-            
-            # Add to result
-            result.append({
-                "type": element_type,
-                "text": text,
-                "metadata": metadata
-            })
+        # A PDF without a text layer (e.g. a scan) needs layout detection and OCR
+        if PDF_STRATEGY == "fast" and not any(element["text"].strip() for element in result):
+            logger.info("No text layer found in %s, retrying with hi_res", file_path)
+            result = _partition_to_dicts(file_path, "hi_res")
         
-        logger.info(f"Parsed {len(result)} elements from PDF using unstructured")
+        logger.info("Parsed %d elements from PDF using unstructured", len(result))
         return result
         
     except Exception as e:
-        logger.error(f"Error parsing PDF with unstructured: {str(e)}")
+        logger.error("Error parsing PDF with unstructured: %s", e)
         logger.error(traceback.format_exc())
         
-        # Try fallback with PyPDF if available
+        # Try fallback with PDFium, then PyPDF, if available
+        if PDFIUM_AVAILABLE:
+            logger.info("Attempting fallback with PDFium")
+            try:
+                return extract_text_with_pdfium(file_path)
+            except Exception as pdfium_error:
+                logger.error("Error in PDFium fallback: %s", pdfium_error)
+        
         if PYPDF_AVAILABLE:
             logger.info("Attempting fallback with PyPDF")
             return extract_text_with_pypdf(file_path)
@@ -7,7 +7,6 @@ from typing import Dict, List, Optional, Union, Any
 import pypdf
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Try to import unstructured, but provide fallback if it fails
@@ -23,11 +22,11 @@ try:
     )
     UNSTRUCTURED_AVAILABLE = True
 except ImportError as e:
-    logger.warning(f"Could not import unstructured: {str(e)}")
+    logger.warning("Could not import unstructured: %s", e)
     logger.warning("Falling back to basic PDF processing without structured elements")
     UNSTRUCTURED_AVAILABLE = False
 
-from src.utils.parser import parse_pdf
+from src.utils.parser import PDFIUM_AVAILABLE, extract_text_with_pdfium, parse_pdf
 
 def extract_text_with_pypdf(pdf_path: str) -> str:
     """
@@ -41,40 +40,53 @@ def extract_text_with_pypdf(pdf_path: str) -> str:
     """
     with open(pdf_path, "rb") as file:
         pdf_reader = pypdf.PdfReader(file)
-        text = ""
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text += page.extract_text()
-    return text
+        return "".join(page.extract_text() for page in pdf_reader.pages)
 
-def extract_structured_elements(pdf_path: str) -> List[Dict]:
+def _extract_fallback_elements(pdf_path: str) -> List[Dict]:
+    """
+    Extract page text without unstructured, preferring PDFium over PyPDF.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        
+    Returns:
+        List of text elements
+    """
+    if PDFIUM_AVAILABLE:
+        try:
+            return extract_text_with_pdfium(pdf_path)
+        except Exception as e:
+            logger.error("Error in PDFium fallback: %s", e)
+    
+    text = extract_text_with_pypdf(pdf_path)
+    
+    # Create a simple structure with the extracted text
+    return [{
+        "type": "NarrativeText",
+        "text": text,
+        "metadata": {"page_number": 1}
+    }]
+
+def extract_structured_elements(pdf_path: str, extract_images: bool = False) -> List[Dict]:
     """
     Extract structured elements from PDF using Unstructured.
     
     Args:
         pdf_path: Path to the PDF file
+        extract_images: Whether to extract embedded images as elements
         
     Returns:
         List of structured elements as dictionaries
     """
     if not UNSTRUCTURED_AVAILABLE:
         # Fallback to basic extraction if unstructured is not available
-        text = extract_text_with_pypdf(pdf_path)
-        
-        # Create a simple structure with the extracted text
-        elements = [{
-            "type": "NarrativeText",
-            "text": text,
-            "metadata": {"page_number": 1}
-        }]
-        
-        return elements
+        return _extract_fallback_elements(pdf_path)
     
     try:
         # Use unstructured for advanced extraction
         raw_elements = partition_pdf(
             pdf_path,
-            extract_images_in_pdf=True,
+            extract_images_in_pdf=extract_images,
             infer_table_structure=True,
             chunking_strategy="by_title",
             max_characters=4000,
@@ -87,20 +99,11 @@ def extract_structured_elements(pdf_path: str) -> List[Dict]:
         return elements
     
     except Exception as e:
-        logger.error(f"Error using unstructured: {str(e)}")
+        logger.error("Error using unstructured: %s", e)
         logger.info("Falling back to basic PDF processing")
         
         # Fallback to basic extraction
-        text = extract_text_with_pypdf(pdf_path)
-        
-        # Create a simple structure with the extracted text
-        elements = [{
-            "type": "NarrativeText",
-            "text": text,
-            "metadata": {"page_number": 1}
-        }]
-        
-        return elements
+        return _extract_fallback_elements(pdf_path)
 
 def element_to_dict(element: Element) -> Dict:
     """
@@ -116,24 +119,29 @@ def element_to_dict(element: Element) -> Dict:
         return {}
     
     element_type = type(element).__name__
+    element_metadata = getattr(element, "metadata", None)
     
     result = {
         "type": element_type,
-        "text": str(element),
+        "text": getattr(element, "text", None) or str(element),
         "metadata": {}
     }
     
-    # Add element-specific metadata
-    if hasattr(element, "metadata"):
-        result["metadata"] = element.metadata.to_dict() if hasattr(element.metadata, "to_dict") else element.metadata
-    
-    # Add page number if available
-    if hasattr(element, "metadata") and hasattr(element.metadata, "page_number"):
-        result["metadata"]["page_number"] = element.metadata.page_number
-    
-    # Add table data if it's a table
-    if element_type == "Table" and hasattr(element, "metadata") and hasattr(element.metadata, "text_as_html"):
-        result["metadata"]["html"] = element.metadata.text_as_html
+    if element_metadata is not None:
+        # Add element-specific metadata
+        to_dict = getattr(element_metadata, "to_dict", None)
+        metadata = result["metadata"] = to_dict() if to_dict is not None else element_metadata
+        
+        # Add page number if available
+        page_number = getattr(element_metadata, "page_number", None)
+        if page_number is not None:
+            metadata["page_number"] = page_number
+        
+        # Add table data if it's a table
+        if isinstance(element, Table):
+            html = getattr(element_metadata, "text_as_html", None)
+            if html is not None:
+                metadata["html"] = html
     
     return result
 
@@ -149,7 +157,7 @@ def process_pdf(file_path: str) -> List[Dict[str, Any]]:
     """
     # Check if file exists
     if not os.path.exists(file_path):
-        logger.error(f"File not found: {file_path}")
+        logger.error("File not found: %s", file_path)
         raise FileNotFoundError(f"File not found: {file_path}")
     
     # Parse PDF
@@ -6,6 +6,9 @@ import os
 from typing import List
 from fastapi import HTTPException
 
+# Supported upload types, in the order they are reported
+_SUPPORTED_EXTENSIONS = ('.pdf', '.html', '.htm')
+
 def validate_file_type(filename: str) -> str:
     """
     Validate file type and return the extension.
@@ -23,7 +26,7 @@ def validate_file_type(filename: str) -> str:
     file_extension = os.path.splitext(filename)[1].lower()
     
     # Check if file type is supported
-    if file_extension not in ['.pdf', '.html', '.htm']:
+    if file_extension not in _SUPPORTED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
             detail="Unsupported file type. Only PDF and HTML files are allowed."
@@ -33,7 +36,7 @@ def validate_file_type(filename: str) -> str:
 
 def get_supported_extensions() -> List[str]:
     """Get list of supported file extensions."""
-    return ['.pdf', '.html', '.htm']
+    return list(_SUPPORTED_EXTENSIONS)
 
 def create_upload_folder(folder_path: str) -> None:
     """
@@ -10,6 +10,7 @@ import logging
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
@@ -21,6 +22,9 @@ logger = logging.getLogger(__name__)
 # API base URL
 BASE_URL = "http://localhost:8000"
 
+# Reuse connections across requests
+session = requests.Session()
+
 def test_upload(pdf_path):
     """Test the file upload endpoint."""
     logger.info(f"Testing file upload: {pdf_path}")
@@ -29,7 +33,7 @@ def test_upload(pdf_path):
     
     with open(pdf_path, "rb") as f:
         files = {"file": (os.path.basename(pdf_path), f, "application/pdf")}
-        response = requests.post(url, files=files)
+        response = session.post(url, files=files)
     
     if response.status_code == 200:
         result = response.json()
@@ -50,7 +54,7 @@ def test_recursive_chunking(pdf_path):
         "collection_name": None
     }
     
-    response = requests.post(url, json=data)
+    response = session.post(url, json=data)
     
     if response.status_code == 200:
         result = response.json()
@@ -71,7 +75,7 @@ def test_semantic_chunking(pdf_path):
         "collection_name": None
     }
     
-    response = requests.post(url, json=data)
+    response = session.post(url, json=data)
     
     if response.status_code == 200:
         result = response.json()
@@ -91,7 +95,7 @@ def test_rag_query(query):
         "query": query
     }
     
-    response = requests.post(url, json=data)
+    response = session.post(url, json=data)
     
     if response.status_code == 200:
         result = response.json()
@@ -112,7 +116,7 @@ def main():
     
     # Check if the server is running
     try:
-        response = requests.get(f"{BASE_URL}/")
+        response = session.get(f"{BASE_URL}/")
         if response.status_code != 200:
             logger.error(f"Server is not responding correctly: {response.status_code} - {response.text}")
             return 1
@@ -134,13 +138,15 @@ def main():
     
     # Test chunking
     if not args.skip_chunking:
-        # Test recursive chunking
-        recursive_result = test_recursive_chunking(pdf_path)
+        # Both chunking endpoints are independent, so run them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            recursive_future = executor.submit(test_recursive_chunking, pdf_path)
+            semantic_future = executor.submit(test_semantic_chunking, pdf_path)
+            recursive_result = recursive_future.result()
+            semantic_result = semantic_future.result()
+        
         if not recursive_result:
             logger.error("Recursive chunking failed, but continuing with other tests")
-        
-        # Test semantic chunking
-        semantic_result = test_semantic_chunking(pdf_path)
         if not semantic_result:
             logger.error("Semantic chunking failed, but continuing with other tests")
     else:
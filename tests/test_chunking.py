@@ -0,0 +1,59 @@
+"""
+Tests for recursive chunking.
+"""
+import random
+
+import pytest
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.chunking.recursive import RecursiveChunker, _TEXT_SPLITTER
+from src.utils.config import RECURSIVE_CHUNK_SIZE, RECURSIVE_CHUNK_OVERLAP
+
+
+def chunker():
+    """Build a recursive chunker without connecting to Bedrock or Qdrant."""
+    recursive_chunker = RecursiveChunker.__new__(RecursiveChunker)
+    recursive_chunker.chunk_size = RECURSIVE_CHUNK_SIZE
+    recursive_chunker.chunk_overlap = RECURSIVE_CHUNK_OVERLAP
+    recursive_chunker.text_splitter = _TEXT_SPLITTER
+    return recursive_chunker
+
+
+def split_at_once(texts, chunk_size, chunk_overlap):
+    """Chunk the joined text in one go, as chunk_documents originally did."""
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        is_separator_regex=False
+    )
+    return splitter.split_text("\n\n".join(text for text in texts if text.strip()))
+
+
+def random_text(rng):
+    """Build text with words, lines and paragraphs of varying length."""
+    words = ["revenue", "a", "growth", "quarterly", "x" * 40, "table", "of"]
+    separators = [" ", " ", " ", "\n", "\n\n"]
+    return "".join(rng.choice(words) + rng.choice(separators) for _ in range(rng.randint(0, 150)))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_iter_chunks_matches_splitting_joined_text(seed):
+    """Test that streamed chunks match splitting all document text at once."""
+    rng = random.Random(seed)
+    recursive_chunker = chunker()
+    texts = [random_text(rng) for _ in range(rng.randint(1, 12))]
+    documents = [{"text": text, "metadata": {"source": "report.pdf"}} for text in texts]
+    
+    chunks = list(recursive_chunker.iter_chunks(documents))
+    
+    expected = split_at_once(texts, recursive_chunker.chunk_size, recursive_chunker.chunk_overlap)
+    assert [chunk["content"] for chunk in chunks] == expected
+    assert all(chunk["metadata"]["source"] == "report.pdf" for chunk in chunks)
+
+
+def test_iter_chunks_without_text_yields_nothing():
+    """Test that documents without text produce no chunks."""
+    documents = [{"text": "", "metadata": {}}, {"text": "  \n", "metadata": {}}]
+    
+    assert list(chunker().iter_chunks(documents)) == []
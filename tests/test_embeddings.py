@@ -0,0 +1,22 @@
+"""
+Tests for the embeddings cache encoding.
+"""
+from array import array
+
+from src.embeddings.titan import TitanEmbeddings
+
+
+def test_cached_embeddings_round_trip_as_float32():
+    """Test that packed embeddings decode to their float32 values."""
+    embedding = [0.5, -0.25, 0.1, 3.0]
+    
+    packed = TitanEmbeddings._encode_embedding(embedding)
+    
+    assert len(packed) == 4 * len(embedding)
+    assert TitanEmbeddings._decode_embedding(packed) == array("f", embedding).tolist()
+
+
+def test_cached_embeddings_accept_misses_and_old_entries():
+    """Test that misses stay misses and entries cached as lists are returned as-is."""
+    assert TitanEmbeddings._decode_embedding(None) is None
+    assert TitanEmbeddings._decode_embedding([0.5, -0.25]) == [0.5, -0.25]
@@ -0,0 +1,39 @@
+"""
+Tests for HTML parsing helpers.
+"""
+import pytest
+
+# The HTML parser needs the full document parsing stack
+html_parser = pytest.importorskip("src.utils.html_parser")
+
+
+def parser_for(html):
+    """Build an HTML parser over markup without reading a file."""
+    parser = html_parser.HTMLParser.__new__(html_parser.HTMLParser)
+    parser.soup = html_parser.BeautifulSoup(html, html_parser.BS4_PARSER)
+    return parser
+
+
+def test_headers_and_lists_keep_grouped_order():
+    """Test that headers are grouped by level and unordered lists come first."""
+    parser = parser_for("<h2>b</h2><ol><li>1</li></ol><h1>a</h1><ul><li>x</li></ul><h1>c</h1>")
+    
+    assert [h["text"] for h in parser._extract_headers()] == ["a", "c", "b"]
+    assert [lst["type"] for lst in parser._extract_lists()] == ["unordered", "ordered"]
+
+
+@pytest.mark.parametrize("headers, rows", [
+    (["Year", "Revenue"], [["2023", "10"], ["2024", "12"]]),
+    ([], [["a", "b"]]),
+    (["Year"], []),
+])
+def test_table_to_text_format(headers, rows):
+    """Test the readable table text: caption, header rule and one line per row."""
+    expected = "Revenue\n\n"
+    if headers:
+        expected += " | ".join(headers) + "\n"
+        expected += "-" * (sum(len(h) for h in headers) + 3 * (len(headers) - 1)) + "\n"
+    for row in rows:
+        expected += " | ".join(row) + "\n"
+    
+    assert parser_for("")._table_to_text("Revenue", headers, rows) == expected
@@ -0,0 +1,65 @@
+"""
+Tests for retrieval result ranking.
+"""
+import pytest
+
+# The query module needs the full LangChain stack
+query = pytest.importorskip("src.rag.query")
+
+
+def result(text, **metadata):
+    """Build a raw search result."""
+    return {"text": text, "metadata": metadata, "score": 1.0}
+
+
+def rank(results, collection_name=query.SEMANTIC_COLLECTION_NAME, is_table_query=True, k=10):
+    """Rank results without connecting to Bedrock or Qdrant."""
+    rag_query = query.RAGQuery.__new__(query.RAGQuery)
+    return [doc.page_content for doc in rag_query._rank_results(collection_name, results, is_table_query, k)]
+
+
+def test_rank_results_keeps_order_for_text_queries():
+    """Test that non-table queries keep the search order."""
+    results = [
+        result("text"),
+        result("display", type="table", table_id="t1", table_purpose="display"),
+        result("query", type="table", table_id="t1", table_purpose="query")
+    ]
+    
+    assert rank(results, is_table_query=False) == ["text", "display", "query"]
+    assert rank(results, collection_name="other") == ["text", "display", "query"]
+
+
+def test_rank_results_prioritizes_best_table_format():
+    """Test that each table contributes its best purpose and its JSON document before text."""
+    results = [
+        result("text"),
+        result("t1 display", type="table", table_id="t1", table_purpose="display"),
+        result("t1 json", type="table", table_id="t1", table_purpose="overview", table_format="json"),
+        result("t1 query", type="table", table_id="t1", table_purpose="query"),
+        result("t2 analysis", type="table", table_id="t2", table_purpose="analysis")
+    ]
+    
+    assert rank(results) == ["t1 query", "t1 json", "t2 analysis", "text"]
+
+
+def test_rank_results_limits_to_k():
+    """Test that at most k documents are returned."""
+    results = [result(f"text {i}") for i in range(5)]
+    
+    assert rank(results, k=2) == ["text 0", "text 1"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("What was the average revenue?", True),
+    ("Show the TABLE of results", True),
+    ("Revenue growth by year", True),
+    ("Who founded the company?", False),
+    ("Tables and columns", False),
+    ("metadata about the report", False),
+])
+def test_is_table_query_matches_whole_keywords(text, expected):
+    """Test that only whole table keywords, in any case, mark a table query."""
+    rag_query = query.RAGQuery.__new__(query.RAGQuery)
+    
+    assert rag_query.is_table_query(text) is expected
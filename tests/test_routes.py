@@ -0,0 +1,27 @@
+"""
+Tests for API route helpers.
+"""
+import orjson
+import pytest
+from langchain_core.documents import Document
+
+# The routes import the document parsers and the RAG query stack
+routes = pytest.importorskip("api.routes")
+
+
+def test_parse_cache_round_trip():
+    """Test that cached documents and element dicts decode to what was stored."""
+    documents = [
+        Document(page_content="Revenue grew 10%", metadata={"page_number": 1}),
+        {"type": "Table", "text": "Year | Revenue", "metadata": {"page_number": 2}}
+    ]
+    
+    assert routes._decode_parsed(routes._encode_parsed(documents)) == documents
+
+
+def test_parse_cache_rejects_other_versions():
+    """Test that entries written by another cache version are not decoded."""
+    data = orjson.dumps({"version": routes.PARSE_CACHE_VERSION - 1, "documents": []})
+    
+    with pytest.raises(ValueError):
+        routes._decode_parsed(data)
@@ -0,0 +1,53 @@
+"""
+Tests for semantic chunking helpers.
+"""
+import json
+
+import pandas as pd
+import pytest
+
+# The semantic chunker needs the full document parsing stack
+semantic = pytest.importorskip("src.chunking.semantic")
+
+
+def dataframe_records(headers, rows):
+    """Build records the way a DataFrame serialized to JSON does."""
+    df = pd.DataFrame(rows, columns=headers if headers else None)
+    return json.loads(df.to_json(orient='records'))
+
+
+@pytest.mark.parametrize("headers, rows", [
+    (["Year", "Revenue"], [["2023", "10"], ["2024", "12"]]),
+    (["Year", "Revenue", "Profit"], [["2023", "10", "2"], ["2024", "12"]]),
+    ([], [["a", "b"], ["c"]]),
+    (["Year"], []),
+])
+def test_table_records_match_dataframe(headers, rows):
+    """Test that table records match what a DataFrame would produce."""
+    assert semantic._table_records(headers, rows) == dataframe_records(headers, rows)
+
+
+@pytest.mark.parametrize("headers, rows", [
+    (["Year", "Revenue"], [["2023", "10", "extra"]]),
+    (["Year", "Year"], [["2023", "2024"]]),
+])
+def test_table_records_reject_what_dataframe_rejects(headers, rows):
+    """Test that invalid tables raise like a DataFrame would."""
+    with pytest.raises(ValueError):
+        dataframe_records(headers, rows)
+    with pytest.raises(ValueError):
+        semantic._table_records(headers, rows)
+
+
+def test_table_ids_come_from_table_content():
+    """Test that table IDs are stable across runs and follow the table content."""
+    chunker = semantic.SemanticChunker()
+    table = {"text": "Year | Revenue", "metadata": {"page_number": 3}}
+    
+    first = chunker.process_table(table)[0].metadata["table_id"]
+    again = chunker.process_table(dict(table))[0].metadata["table_id"]
+    other = chunker.process_table({**table, "text": "Year | Profit"})[0].metadata["table_id"]
+    
+    assert first == again
+    assert first.startswith("table_3_")
+    assert other != first
@@ -0,0 +1,136 @@
+"""
+Tests for storage helpers.
+"""
+import uuid
+
+from qdrant_client import QdrantClient
+
+from src.storage import cache as cache_module
+from src.storage.cache import SemanticQueryCache
+from src.storage.qdrant import QdrantStorage, point_id
+
+
+def memory_storage():
+    """Build Qdrant storage backed by an in-memory client."""
+    storage = QdrantStorage.__new__(QdrantStorage)
+    storage.prefix = "test_"
+    storage.client = QdrantClient(":memory:")
+    return storage
+
+
+def unit_vector(index):
+    """Build an embedding-sized unit vector along one axis."""
+    vector = [0.0] * cache_module.EMBEDDING_DIMENSION
+    vector[index] = 1.0
+    return vector
+
+
+def test_point_id_is_stable_uuid():
+    """Test that the same content always maps to the same UUID."""
+    first = point_id("Revenue grew 10%", {"page_number": 1, "source": "report.pdf"})
+    second = point_id("Revenue grew 10%", {"source": "report.pdf", "page_number": 1})
+    
+    assert first == second
+    assert str(uuid.UUID(first)) == first
+
+
+def test_point_id_depends_on_text_and_metadata():
+    """Test that different text or metadata gives a different ID."""
+    base = point_id("Revenue grew 10%", {"page_number": 1})
+    
+    assert point_id("Revenue grew 11%", {"page_number": 1}) != base
+    assert point_id("Revenue grew 10%", {"page_number": 2}) != base
+    assert point_id("Revenue grew 10%") == point_id("Revenue grew 10%", {})
+
+
+def test_storing_a_file_again_reuses_collection_and_points():
+    """Test that reprocessing the same chunks keeps one point per chunk."""
+    storage = memory_storage()
+    texts = ["Revenue grew 10%", "Profit fell 2%"]
+    metadatas = [{"page_number": 1}, {"page_number": 2}]
+    vectors = [[1.0] + [0.0] * 1535, [0.0, 1.0] + [0.0] * 1534]
+    
+    for _ in range(2):
+        storage.ensure_collection("report")
+        storage.store_documents("report", texts, None, metadatas, vectors=vectors)
+    
+    assert storage.client.count("test_report").count == 2
+
+
+def test_query_cache_hits_stored_queries_in_qdrant():
+    """Test that a stored response is found again through Qdrant for its scope only."""
+    storage = memory_storage()
+    SemanticQueryCache(storage, threshold=0.9).store(
+        "revenue", unit_vector(0), "recursive", "semantic", {"answer": "cached"}
+    )
+    
+    # A fresh cache has nothing in process, so hits come from Qdrant
+    query_cache = SemanticQueryCache(storage, threshold=0.9)
+    assert query_cache.lookup(unit_vector(0), "recursive", "semantic") == {"answer": "cached"}
+    assert query_cache.lookup(unit_vector(0), "recursive", "other") is None
+    assert query_cache.lookup(unit_vector(0), "recursive", "semantic", kind="raw") is None
+    assert query_cache.lookup(unit_vector(1), "recursive", "semantic") is None
+
+
+def test_query_cache_invalidate_drops_qdrant_entries():
+    """Test that invalidating a collection drops the responses built from it."""
+    storage = memory_storage()
+    SemanticQueryCache(storage, threshold=0.9).store(
+        "revenue", unit_vector(0), "recursive", "semantic", {"answer": "cached"}
+    )
+    
+    SemanticQueryCache(storage, threshold=0.9).invalidate("semantic")
+    
+    query_cache = SemanticQueryCache(storage, threshold=0.9)
+    assert query_cache.lookup(unit_vector(0), "recursive", "semantic") is None
+
+
+def test_local_lookup_hits_within_scope():
+    """Test that the local tier answers similar queries for the same scope only."""
+    query_cache = SemanticQueryCache(memory_storage(), threshold=0.9)
+    scope = ("response", "recursive", "semantic")
+    query = query_cache._normalize(unit_vector(0))
+    query_cache._local_store(query, scope, {"answer": "cached"})
+    
+    assert query_cache._local_lookup(query, scope) == {"answer": "cached"}
+    
+    # Other kinds or collections never answer for each other
+    assert query_cache._local_lookup(query, ("raw", "recursive", "semantic")) is None
+    assert query_cache._local_lookup(query, ("response", "recursive", "other")) is None
+    
+    # Dissimilar queries miss
+    assert query_cache._local_lookup(query_cache._normalize(unit_vector(1)), scope) is None
+
+
+def test_local_lookup_expires_entries(monkeypatch):
+    """Test that local entries are dropped once their TTL has passed."""
+    monkeypatch.setattr(cache_module, "QUERY_CACHE_LOCAL_TTL", -1)
+    query_cache = SemanticQueryCache(memory_storage(), threshold=0.9)
+    scope = ("response", "recursive", "semantic")
+    query = query_cache._normalize(unit_vector(0))
+    query_cache._local_store(query, scope, {"answer": "stale"})
+    
+    assert query_cache._local_lookup(query, scope) is None
+    assert all(entry is None for entry in query_cache._local_entries)
+
+
+def test_invalidate_clears_local_entries():
+    """Test that invalidating a collection drops its local entries."""
+    query_cache = SemanticQueryCache(memory_storage(), threshold=0.9)
+    scope = ("response", "recursive", "semantic")
+    query = query_cache._normalize(unit_vector(0))
+    query_cache._local_store(query, scope, {"answer": "cached"})
+    
+    query_cache.invalidate("semantic")
+    
+    assert query_cache._local_lookup(query, scope) is None
+
+
+def test_query_cache_treats_malformed_vectors_as_misses():
+    """Test that vectors of the wrong size are logged and missed instead of raising."""
+    query_cache = SemanticQueryCache(memory_storage(), threshold=0.9)
+    
+    query_cache.store("revenue", [1.0, 0.0], "recursive", "semantic", {"answer": "cached"})
+    
+    assert query_cache.lookup([1.0, 0.0], "recursive", "semantic") is None
+    assert all(entry is None for entry in query_cache._local_entries)